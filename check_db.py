@@ -1,7 +1,10 @@
 import sqlite3
 
+from db_utils import tune_conn
+
 # Connect to database
 conn = sqlite3.connect('certs.db')
+tune_conn(conn)
 cursor = conn.cursor()
 
 # Check for USN 1BG19CS100
@@ -0,0 +1,37 @@
+"""
+Convert a trained DETR seal model's pickled .bin weights to safetensors.
+
+Run once after downloading/training the model, before deploying it:
+
+    python convert_detr_to_safetensors.py [model_dir]
+
+DETRSealDetector loads model.safetensors (mmap-friendly, no pickle) when it
+is present and never writes into the model directory itself.
+"""
+
+import os
+import sys
+from transformers import DetrForObjectDetection
+
+def convert(model_path='detr_seal_model/final_model'):
+    """Write model.safetensors next to the existing weights; returns True on success."""
+    if not os.path.exists(model_path):
+        print(f"❌ Model path not found: {model_path}")
+        return False
+    
+    if os.path.exists(os.path.join(model_path, 'model.safetensors')):
+        print(f"✅ {model_path} already has model.safetensors")
+        return True
+    
+    try:
+        model = DetrForObjectDetection.from_pretrained(model_path)
+        model.save_pretrained(model_path, safe_serialization=True)
+        print(f"✅ Converted DETR weights in {model_path} to safetensors")
+        return True
+    except Exception as e:
+        print(f"❌ Could not convert DETR weights to safetensors: {e}")
+        return False
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else 'detr_seal_model/final_model'
+    sys.exit(0 if convert(path) else 1)
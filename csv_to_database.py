@@ -5,19 +5,19 @@ Extract student data from CSV and add to certificate verification database
 
 import sqlite3
 import pandas as pd
+import numpy as np
 import os
-from datetime import datetime
 import logging
 
+from db_utils import tune_conn
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def update_database_schema():
+def update_database_schema(conn):
     """Update database schema to include additional fields from CSV"""
     
-    db_path = "certs.db"
-    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
     try:
@@ -45,8 +45,48 @@ def update_database_schema():
     except sqlite3.OperationalError:
         pass  # Column already exists
     
+    # Rebuild certificates as a clustered WITHOUT ROWID table on first run
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'certificates'")
+    table_sql = cursor.fetchone()
+    rebuild = table_sql is None or "WITHOUT ROWID" not in table_sql[0].upper()
+    if rebuild and table_sql is not None:
+        # reg_no becomes the primary key: rows without one, or sharing one, cannot be carried over
+        cursor.execute("SELECT COUNT(*) - COUNT(reg_no), COUNT(reg_no) - COUNT(DISTINCT reg_no) FROM certificates")
+        null_count, duplicate_count = cursor.fetchone()
+        if null_count or duplicate_count:
+            logger.error(f"❌ Not rebuilding certificates as WITHOUT ROWID: {null_count} rows have no reg_no "
+                         f"and {duplicate_count} rows repeat a reg_no; fix them first so no rows are lost")
+            rebuild = False
+    if rebuild:
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS certificates_v2 (
+            reg_no TEXT PRIMARY KEY NOT NULL,
+            usn TEXT,
+            name TEXT,
+            father_name TEXT,
+            institution TEXT,
+            degree TEXT,
+            year INTEGER,
+            assigned_date TEXT,
+            certificate_type TEXT,
+            notes TEXT
+        ) WITHOUT ROWID
+        ''')
+        if table_sql is not None:
+            cursor.execute('''
+            INSERT INTO certificates_v2
+            (reg_no, usn, name, father_name, institution, degree, year, assigned_date, certificate_type, notes)
+            SELECT reg_no, usn, name, father_name, institution, degree, year, assigned_date, certificate_type, notes
+            FROM certificates
+            ''')
+            cursor.execute("DROP TABLE certificates")
+        cursor.execute("ALTER TABLE certificates_v2 RENAME TO certificates")
+        logger.info("Rebuilt certificates as a WITHOUT ROWID table")
+    
+    # reg_no is the clustered key; index usn so USN queries avoid full table scans
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cert_usn ON certificates(usn)")
+    
     conn.commit()
-    conn.close()
     logger.info("✅ Database schema updated successfully")
 
 def extract_csv_data():
@@ -59,8 +99,14 @@ def extract_csv_data():
         return None
     
     try:
-        # Read CSV file
-        df = pd.read_csv(csv_file)
+        # Read only the columns we use, parsing dates in the C reader
+        df = pd.read_csv(
+            csv_file,
+            usecols=['Serial No.', "Father's Name", "Son's Name", 'Assigned Date'],
+            dtype={'Serial No.': 'string', "Father's Name": 'string', "Son's Name": 'string'},
+            parse_dates=['Assigned Date'],
+            date_format="%d %B %Y"
+        )
         logger.info(f"📊 Loaded {len(df)} records from CSV")
         
         # Display CSV structure
@@ -76,78 +122,77 @@ def extract_csv_data():
         logger.error(f"❌ Error reading CSV: {e}")
         return None
 
-def process_and_insert_data(df):
+def process_and_insert_data(df, conn):
     """Process CSV data and insert into database"""
     
     if df is None:
         return False
     
-    db_path = "certs.db"
-    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
-    success_count = 0
-    error_count = 0
-    
     print("\n🔄 Processing CSV data...")
     
-    for index, row in df.iterrows():
-        try:
-            # Extract data from CSV
-            usn = str(row['Serial No.']).strip()
-            father_name = str(row["Father's Name"]).strip()
-            student_name = str(row["Son's Name"]).strip()
-            assigned_date = str(row['Assigned Date']).strip()
-            
-            # Generate additional data based on USN pattern
-            institution = "B.N.M. INSTITUTE OF TECHNOLOGY, BANGALORE"
-            degree = "B.E. Computer Science & Engineering"
-            
-            # Extract year from USN (1BG19CS098 -> 2019 batch, graduation ~2023)
-            if usn.startswith("1BG19CS"):
-                batch_year = 2019
-                graduation_year = 2023
-            else:
-                batch_year = 2019  # Default
-                graduation_year = 2023
-            
-            # Parse assigned date to get year
-            try:
-                date_obj = datetime.strptime(assigned_date, "%d %B %Y")
-                cert_year = date_obj.year
-            except:
-                cert_year = graduation_year
-            
-            # Insert into database
-            cursor.execute('''
-            INSERT OR REPLACE INTO certificates 
-            (reg_no, usn, name, father_name, institution, degree, year, assigned_date, certificate_type, notes) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                usn,  # reg_no = USN
-                usn,  # usn = USN  
-                student_name,  # name = Student name
-                father_name,  # father_name = Father's name
-                institution,  # institution
-                degree,  # degree
-                cert_year,  # year
-                assigned_date,  # assigned_date
-                "Degree Certificate",  # certificate_type
-                f"Imported from CSV - Batch {batch_year}"  # notes
-            ))
-            
-            success_count += 1
-            
-            if success_count % 5 == 0:
-                print(f"   ✅ Processed {success_count} records...")
-                
-        except Exception as e:
-            error_count += 1
-            logger.warning(f"⚠️ Error processing row {index}: {e}")
-            continue
+    # Extract data from CSV as whole columns
+    columns = df[['Serial No.', "Father's Name", "Son's Name"]].astype(str)
+    columns = columns.apply(lambda col: col.str.strip())
+    usns = columns['Serial No.']
     
-    conn.commit()
-    conn.close()
+    # Dates are normally parsed by read_csv; fall back to parsing strings here
+    assigned = df['Assigned Date']
+    if pd.api.types.is_datetime64_any_dtype(assigned):
+        dates = assigned
+        assigned_dates = dates.dt.strftime("%d %B %Y")
+    else:
+        assigned_dates = assigned.astype(str).str.strip()
+        dates = pd.to_datetime(assigned_dates, format="%d %B %Y", errors='coerce')
+    
+    # Generate additional data based on USN pattern
+    institution = "B.N.M. INSTITUTE OF TECHNOLOGY, BANGALORE"
+    degree = "B.E. Computer Science & Engineering"
+    
+    # Extract year from USN (1BG19CS098 -> 2019 batch, graduation ~2023)
+    batch_years = np.where(usns.str.startswith("1BG19CS"), 2019, 2019)  # Default 2019
+    graduation_year = 2023
+    
+    # Unparseable dates fall back to graduation year
+    cert_years = dates.dt.year.fillna(graduation_year).astype('int32').to_numpy()
+    
+    # Build rows in a DataFrame shaped like the certificates table
+    out = pd.DataFrame({
+        'reg_no': usns,  # reg_no = USN
+        'usn': usns,  # usn = USN
+        'name': columns["Son's Name"],  # name = Student name
+        'father_name': columns["Father's Name"],  # father_name = Father's name
+        'institution': institution,
+        'degree': degree,
+        'year': cert_years,
+        'assigned_date': assigned_dates,
+        'certificate_type': "Degree Certificate",
+        'notes': "Imported from CSV - Batch " + pd.Series(batch_years, index=usns.index).astype(str)
+    })
+    
+    success_count = 0
+    error_count = 0
+    
+    try:
+        # One prepared INSERT bound to every row inside a single transaction
+        rows = list(out.itertuples(index=False, name=None))
+        conn.execute("BEGIN")
+        cursor.executemany('''
+        INSERT OR REPLACE INTO certificates 
+        (reg_no, usn, name, father_name, institution, degree, year, assigned_date, certificate_type, notes) 
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+        success_count = len(rows)
+        logger.info(f"Inserted {success_count} rows")
+        
+        # Refresh planner statistics so lookups pick the indexes
+        cursor.execute("ANALYZE")
+    except Exception as e:
+        conn.rollback()
+        error_count = len(out)
+        logger.warning(f"⚠️ Error inserting rows: {e}")
     
     print(f"\n📊 Import Summary:")
     print(f"   ✅ Successfully imported: {success_count} records")
@@ -155,11 +200,9 @@ def process_and_insert_data(df):
     
     return success_count > 0
 
-def verify_database_contents():
+def verify_database_contents(conn):
     """Verify the database contents after import"""
     
-    db_path = "certs.db"
-    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
     # Get total count
@@ -185,16 +228,12 @@ def verify_database_contents():
         print(f"           Institution: {institution}")
         print(f"           Degree: {degree}")
         print()
-    
-    conn.close()
 
-def test_ocr_verification():
+def test_ocr_verification(conn):
     """Test OCR verification with sample data from imported records"""
     
     print(f"\n🧪 Testing OCR Verification...")
     
-    db_path = "certs.db"
-    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
     # Get a sample record
@@ -216,8 +255,6 @@ def test_ocr_verification():
         
     else:
         print("   ❌ No sample records found")
-    
-    conn.close()
 
 def main():
     """Main function to extract CSV data and update database"""
@@ -225,32 +262,40 @@ def main():
     print("🚀 CSV Data Extraction and Database Update")
     print("=" * 50)
     
-    # Step 1: Update database schema
-    print("\n1. Updating database schema...")
-    update_database_schema()
-    
-    # Step 2: Extract CSV data
-    print("\n2. Extracting CSV data...")
-    df = extract_csv_data()
-    
-    if df is None:
-        print("❌ Failed to extract CSV data. Exiting.")
-        return
-    
-    # Step 3: Process and insert data
-    print("\n3. Processing and inserting data...")
-    success = process_and_insert_data(df)
-    
-    if not success:
-        print("❌ Failed to insert data. Exiting.")
-        return
-    
-    # Step 4: Verify database contents
-    print("\n4. Verifying database contents...")
-    verify_database_contents()
+    # One tuned connection is shared by every step
+    conn = sqlite3.connect("certs.db")
+    tune_conn(conn)
     
-    # Step 5: Test OCR verification
-    test_ocr_verification()
+    try:
+        # Step 1: Update database schema
+        print("\n1. Updating database schema...")
+        update_database_schema(conn)
+        
+        # Step 2: Extract CSV data
+        print("\n2. Extracting CSV data...")
+        df = extract_csv_data()
+        
+        if df is None:
+            print("❌ Failed to extract CSV data. Exiting.")
+            return
+        
+        # Step 3: Process and insert data
+        print("\n3. Processing and inserting data...")
+        success = process_and_insert_data(df, conn)
+        
+        if not success:
+            print("❌ Failed to insert data. Exiting.")
+            return
+        
+        # Step 4: Verify database contents
+        print("\n4. Verifying database contents...")
+        verify_database_contents(conn)
+        
+        # Step 5: Test OCR verification
+        test_ocr_verification(conn)
+    finally:
+        conn.execute("PRAGMA optimize")
+        conn.close()
     
     print("\n" + "=" * 50)
     print("🎉 CSV Import Completed Successfully!")
@@ -0,0 +1,16 @@
+"""
+SQLite helpers shared by the certificate database scripts
+"""
+
+import sqlite3
+
+
+def tune_conn(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply WAL journaling and performance pragmas to an open connection"""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=10737418240")
+    conn.execute("PRAGMA busy_timeout=3000")
+    return conn
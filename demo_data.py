@@ -0,0 +1,55 @@
+"""
+Sample OCR results used by the app's OCR demo mode.
+
+Kept in an imported module so the data is built once per process instead of
+on every Streamlit rerun of main.py.
+"""
+
+DEMO_CERTIFICATES = {
+    "saksham": {
+        'success': True,
+        'extracted_text': '''CERTIFICATE OF COMPLETION
+                    
+This is to certify that
+
+SAKSHAM SHARMA
+
+has successfully completed the course
+
+B.Tech Computer Engineering
+
+from
+
+DevLabs Institute
+
+in the year 2023
+
+Registration Number: ABC2023001
+
+Date of Issue: December 2023''',
+        'confidence': 0.92,
+        'bounding_boxes': []
+    },
+    "prisha": {
+        'success': True,
+        'extracted_text': '''GRADUATION CERTIFICATE
+                    
+This certifies that
+
+PRISHA VERMA
+
+has completed
+
+M.Tech AI
+
+from
+
+Global Tech University
+
+Year: 2022
+
+Registration: ABC2022007''',
+        'confidence': 0.88,
+        'bounding_boxes': []
+    }
+}
@@ -5,38 +5,70 @@ Creates realistic certificates that can be used for testing the complete verific
 
 import sqlite3
 import os
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+import io
+import hashlib
+from PIL import Image, ImageDraw, ImageFont, PngImagePlugin
 import random
-import colorsys
+import multiprocessing
+import threading
+import numpy as np
+from datetime import datetime
+
+# Loaded fonts keyed by point size, shared by every render
+_FONTS = {}
+
+def _font(size):
+    """Return the Arial font at the given size, loading it only once."""
+    font = _FONTS.get(size)
+    if font is None:
+        try:
+            font = ImageFont.truetype("arial.ttf", size)
+        except:
+            font = ImageFont.load_default()
+        _FONTS[size] = font
+    return font
+
+# One read-only connection per thread, kept open so its page cache stays warm
+_TLS = threading.local()
+
+def _db():
+    """Return this thread's read-only certs.db connection."""
+    conn = getattr(_TLS, 'conn', None)
+    if conn is None:
+        # Read-only, memory-mapped open: table scans become page faults, not read() calls
+        conn = sqlite3.connect('file:certs.db?mode=ro', uri=True, check_same_thread=False)
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA cache_size=-65536')
+        _TLS.conn = conn
+    return conn
 
 def get_all_certificates():
     """Get all certificate records from the database."""
-    conn = sqlite3.connect('certs.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT reg_no, name, institution, degree, year, notes FROM certificates")
-    certificates = cursor.fetchall()
-    conn.close()
-    return certificates
+    cursor = _db().execute("SELECT reg_no, name, institution, degree, year, notes FROM certificates")
+    return cursor.fetchall()
+
+# Institution-specific color schemes
+_COLOR_SCHEMES_BY_INST = {
+    'DevLabs Institute': {'primary': '#1f4e79', 'secondary': '#4a90a4', 'accent': '#87ceeb'},
+    'Global Tech University': {'primary': '#8b0000', 'secondary': '#cd5c5c', 'accent': '#ffd700'},
+    'Northfield University': {'primary': '#006400', 'secondary': '#228b22', 'accent': '#90ee90'},
+    'Sunrise Polytechnic': {'primary': '#ff8c00', 'secondary': '#ffa500', 'accent': '#ffe4b5'},
+    'WestEnd College': {'primary': '#4b0082', 'secondary': '#8a2be2', 'accent': '#dda0dd'},
+    'Metro University': {'primary': '#2f4f4f', 'secondary': '#708090', 'accent': '#b0c4de'},
+    'City College': {'primary': '#b22222', 'secondary': '#dc143c', 'accent': '#ffb6c1'},
+    'Coastal Institute': {'primary': '#008b8b', 'secondary': '#20b2aa', 'accent': '#afeeee'},
+    'International Academy': {'primary': '#800080', 'secondary': '#9932cc', 'accent': '#dda0dd'}
+}
+
+_DEFAULT_SCHEME = {
+    'primary': '#1f4e79', 
+    'secondary': '#4a90a4', 
+    'accent': '#87ceeb'
+}
 
 def get_institution_colors(institution):
     """Get institution-specific color scheme."""
-    color_schemes = {
-        'DevLabs Institute': {'primary': '#1f4e79', 'secondary': '#4a90a4', 'accent': '#87ceeb'},
-        'Global Tech University': {'primary': '#8b0000', 'secondary': '#cd5c5c', 'accent': '#ffd700'},
-        'Northfield University': {'primary': '#006400', 'secondary': '#228b22', 'accent': '#90ee90'},
-        'Sunrise Polytechnic': {'primary': '#ff8c00', 'secondary': '#ffa500', 'accent': '#ffe4b5'},
-        'WestEnd College': {'primary': '#4b0082', 'secondary': '#8a2be2', 'accent': '#dda0dd'},
-        'Metro University': {'primary': '#2f4f4f', 'secondary': '#708090', 'accent': '#b0c4de'},
-        'City College': {'primary': '#b22222', 'secondary': '#dc143c', 'accent': '#ffb6c1'},
-        'Coastal Institute': {'primary': '#008b8b', 'secondary': '#20b2aa', 'accent': '#afeeee'},
-        'International Academy': {'primary': '#800080', 'secondary': '#9932cc', 'accent': '#dda0dd'}
-    }
-    
-    return color_schemes.get(institution, {
-        'primary': '#1f4e79', 
-        'secondary': '#4a90a4', 
-        'accent': '#87ceeb'
-    })
+    return _COLOR_SCHEMES_BY_INST.get(institution, _DEFAULT_SCHEME)
 
 def create_decorative_border(draw, width, height, colors, border_width=20):
     """Create a decorative border around the certificate."""
@@ -61,41 +93,44 @@ def create_decorative_border(draw, width, height, colors, border_width=20):
         draw.ellipse([x, y, x+corner_size, y+corner_size], 
                     outline=colors['accent'], width=3)
 
-def create_institutional_seal(institution, reg_no, size=120):
-    """Create an institutional seal/stamp."""
+def _trim(img):
+    """Crop an RGBA overlay to its drawn pixels; returns (tile, (dx, dy))."""
+    bbox = img.getbbox()
+    if bbox is None:
+        return img, (0, 0)
+    return img.crop(bbox), bbox[:2]
+
+# Abbreviated institution names for seals, computed once per institution
+_INST_SHORT = {}
+
+def _shorten_institution(institution):
+    """Abbreviate an institution name to at most 20 characters for a seal."""
+    short = _INST_SHORT.get(institution)
+    if short is None:
+        short = institution.replace("Institute", "INST").replace("University", "UNIV").replace("Academy", "ACAD")
+        short = _INST_SHORT[institution] = short[:20]
+    return short
+
+# Rendered seal images keyed by everything that affects their pixels
+_SEAL_CACHE = {}
+
+def _draw_seal(institution, size, is_authentic, seal_color, broken):
+    """Draw a seal image for one (institution, variant) combination."""
     seal_img = Image.new('RGBA', (size, size), (255, 255, 255, 0))
     draw = ImageDraw.Draw(seal_img)
     
-    colors = get_institution_colors(institution)
-    
     # Load fonts first
-    try:
-        font_large = ImageFont.truetype("arial.ttf", 14)
-        font_small = ImageFont.truetype("arial.ttf", 10)
-        font_tiny = ImageFont.truetype("arial.ttf", 8)
-    except:
-        font_large = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-        font_tiny = ImageFont.load_default()
-    
-    # Determine if this should be a real or fake seal (90% real, 10% fake for realism)
-    is_authentic = random.random() > 0.1
+    font_large = _font(14)
+    font_small = _font(10)
+    font_tiny = _font(8)
     
     if is_authentic:
-        # Create authentic seal
-        seal_color = colors['primary']
-        
         # Outer circle
         draw.ellipse([5, 5, size-5, size-5], outline=seal_color, width=4)
         draw.ellipse([15, 15, size-15, size-15], outline=seal_color, width=2)
         
-
-        
         # Top arc - Institution name
-        inst_short = institution.replace("Institute", "INST").replace("University", "UNIV").replace("Academy", "ACAD")
-        if len(inst_short) > 20:
-            inst_short = inst_short[:20]
-        
+        inst_short = _shorten_institution(institution)
         draw.text((size//2, 25), inst_short, fill=seal_color, font=font_small, anchor="mm")
         
         # Center - Official text
@@ -111,12 +146,8 @@ def create_institutional_seal(institution, reg_no, size=120):
                     outline=seal_color, width=1)
         
     else:
-        # Create fake/suspicious seal
-        fake_colors = ['#ff0000', '#ffff00', '#ff00ff', '#00ff00']  # Suspicious colors
-        seal_color = random.choice(fake_colors)
-        
         # Distorted or broken circle
-        if random.choice([True, False]):
+        if broken:
             # Broken circle
             draw.arc([5, 5, size-5, size-5], start=0, end=270, fill=seal_color, width=4)
         else:
@@ -127,33 +158,70 @@ def create_institutional_seal(institution, reg_no, size=120):
         # Suspicious text
         draw.text((size//2, size//2), "COPY", fill=seal_color, font=font_small, anchor="mm")
     
-    return seal_img, is_authentic
+    return seal_img
 
-def create_signature(signer_name="Director", authentic=True):
-    """Create a signature image."""
-    sig_img = Image.new('RGBA', (200, 60), (255, 255, 255, 0))
+def create_institutional_seal(institution, reg_no, size=120, rng=None):
+    """
+    Create an institutional seal/stamp.
+    
+    Returns (seal_img, offset, is_authentic); seal_img is trimmed to its drawn
+    pixels and offset is its position inside the size x size square.
+    """
+    rng = rng or random
+    colors = get_institution_colors(institution)
+    
+    # Determine if this should be a real or fake seal (90% real, 10% fake for realism)
+    is_authentic = rng.random() > 0.1
+    
+    if is_authentic:
+        # Create authentic seal
+        seal_color = colors['primary']
+        broken = False
+    else:
+        # Create fake/suspicious seal
+        fake_colors = ['#ff0000', '#ffff00', '#ff00ff', '#00ff00']  # Suspicious colors
+        seal_color = rng.choice(fake_colors)
+        broken = rng.choice([True, False])
+    
+    # Only a handful of distinct seals exist, so render each one once
+    key = (institution if is_authentic else None, size, is_authentic, seal_color, broken)
+    cached = _SEAL_CACHE.get(key)
+    if cached is None:
+        cached = _SEAL_CACHE[key] = _trim(_draw_seal(institution, size, is_authentic, seal_color, broken))
+    seal_img, offset = cached
+    
+    return seal_img, offset, is_authentic
+
+# Blank transparent signature canvas, copied for each signature
+_SIGNATURE_CANVAS = Image.new('RGBA', (200, 60), (255, 255, 255, 0))
+
+def create_signature(signer_name="Director", authentic=True, rng=None):
+    """
+    Create a signature image.
+    
+    Returns (sig_img, offset, authentic); sig_img is trimmed to its drawn
+    pixels and offset is its position inside the 200x60 canvas.
+    """
+    rng = rng or random
+    sig_img = _SIGNATURE_CANVAS.copy()
     draw = ImageDraw.Draw(sig_img)
     
     # Load font first
-    try:
-        font = ImageFont.truetype("arial.ttf", 12)
-    except:
-        font = ImageFont.load_default()
+    font = _font(12)
     
     if authentic:
         # Create realistic signature
         color = '#000080'
         
-        # Signature line (cursive-style)
-        points = []
-        for i in range(0, 180, 5):
-            x = 10 + i
-            y = 30 + random.randint(-8, 8) + int(5 * (i/50))
-            points.append((x, y))
+        # Signature line (cursive-style), all points generated at once
+        offsets = np.arange(0, 180, 5)
+        xs = 10 + offsets
+        jitter = np.random.default_rng(rng.getrandbits(32)).integers(-8, 9, offsets.size)
+        ys = 30 + jitter + (5 * offsets) // 50
+        points = list(zip(xs.tolist(), ys.tolist()))
         
-        # Draw signature curve
-        for i in range(len(points)-1):
-            draw.line([points[i], points[i+1]], fill=color, width=2)
+        # Draw signature curve as a single polyline
+        draw.line(points, fill=color, width=2, joint='curve')
         
         # Add name below
         draw.text((100, 45), signer_name, fill=color, font=font, anchor="mm")
@@ -164,128 +232,176 @@ def create_signature(signer_name="Director", authentic=True):
         
         # Random scribbles
         for _ in range(8):
-            start_x = random.randint(10, 150)
-            start_y = random.randint(20, 40)
-            end_x = start_x + random.randint(-20, 20)
-            end_y = start_y + random.randint(-10, 10)
+            start_x = rng.randint(10, 150)
+            start_y = rng.randint(20, 40)
+            end_x = start_x + rng.randint(-20, 20)
+            end_y = start_y + rng.randint(-10, 10)
             draw.line([(start_x, start_y), (end_x, end_y)], fill=color, width=2)
         
         draw.text((100, 45), "FAKE", fill=color, font=font, anchor="mm")
     
-    return sig_img, authentic
+    sig_img, offset = _trim(sig_img)
+    return sig_img, offset, authentic
 
-def create_complete_certificate(cert_data, cert_type="authentic", output_dir="complete_certificates"):
-    """Create a complete certificate with all elements."""
-    reg_no, name, institution, degree, year, notes = cert_data
-    
-    # Create output directory
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Certificate dimensions
-    width, height = 1200, 900
-    
-    # Create base image
-    img = Image.new('RGB', (width, height), 'white')
+def _stored_fingerprint(filepath):
+    """Fingerprint recorded in an existing certificate PNG, or None."""
+    try:
+        with Image.open(filepath) as existing:
+            return existing.info.get("fingerprint")
+    except (OSError, ValueError):
+        return None
+
+def _write_png(img, filepath, fingerprint=None):
+    """Encode to memory, then write the file with a single open/write/close."""
+    pnginfo = None
+    if fingerprint:
+        # Stored as a tEXt chunk ahead of the pixel data, so it is cheap to read back
+        pnginfo = PngImagePlugin.PngInfo()
+        pnginfo.add_text("fingerprint", fingerprint)
+    buf = io.BytesIO()
+    img.save(buf, "PNG", compress_level=1, pnginfo=pnginfo)  # Mostly flat colour; fast zlib level costs little size
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        data = buf.getbuffer()
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+# Certificate layout, fixed for every record
+_WIDTH, _HEIGHT = 1200, 900
+_CX = _WIDTH // 2
+_SEAL_X, _SEAL_Y = _WIDTH - 200, _HEIGHT - 180
+_SIG_X, _SIG_Y = 100, _HEIGHT - 120
+
+# Pre-rendered certificate backgrounds keyed by institution
+_TEMPLATE_BASES = {}
+
+def _build_base(institution):
+    """Render everything on a certificate that doesn't depend on the record."""
+    img = Image.new('RGB', (_WIDTH, _HEIGHT), 'white')
     draw = ImageDraw.Draw(img)
     
     # Get colors for this institution
     colors = get_institution_colors(institution)
     
     # Create decorative border
-    create_decorative_border(draw, width, height, colors)
+    create_decorative_border(draw, _WIDTH, _HEIGHT, colors)
     
     # Load fonts
-    try:
-        font_title = ImageFont.truetype("arial.ttf", 48)
-        font_subtitle = ImageFont.truetype("arial.ttf", 24)
-        font_text = ImageFont.truetype("arial.ttf", 20)
-        font_small = ImageFont.truetype("arial.ttf", 16)
-        font_name = ImageFont.truetype("arial.ttf", 36)
-    except:
-        font_title = ImageFont.load_default()
-        font_subtitle = ImageFont.load_default()
-        font_text = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-        font_name = ImageFont.load_default()
-    
-    # Certificate content
-    y_pos = 80
+    font_title = _font(48)
+    font_subtitle = _font(24)
+    font_text = _font(20)
+    font_small = _font(16)
     
     # Title
-    draw.text((width//2, y_pos), "CERTIFICATE", fill=colors['primary'], font=font_title, anchor="mm")
-    y_pos += 60
-    
-    draw.text((width//2, y_pos), "OF COMPLETION", fill=colors['primary'], font=font_subtitle, anchor="mm")
-    y_pos += 80
+    draw.text((_CX, 80), "CERTIFICATE", fill=colors['primary'], font=font_title, anchor="mm")
+    draw.text((_CX, 140), "OF COMPLETION", fill=colors['primary'], font=font_subtitle, anchor="mm")
     
     # Institution logo placeholder (decorative element)
     logo_size = 80
-    draw.ellipse([width//2-logo_size//2, y_pos-40, width//2+logo_size//2, y_pos+40], 
+    draw.ellipse([_CX-logo_size//2, 220-40, _CX+logo_size//2, 220+40], 
                 outline=colors['secondary'], width=3)
-    draw.text((width//2, y_pos), "LOGO", fill=colors['secondary'], font=font_small, anchor="mm")
-    y_pos += 80
+    draw.text((_CX, 220), "LOGO", fill=colors['secondary'], font=font_small, anchor="mm")
     
-    # Certification text
-    draw.text((width//2, y_pos), "This is to certify that", fill='black', font=font_text, anchor="mm")
-    y_pos += 60
+    # Certification and achievement text
+    draw.text((_CX, 300), "This is to certify that", fill='black', font=font_text, anchor="mm")
+    draw.text((_CX, 440), "has successfully completed the program", fill='black', font=font_text, anchor="mm")
     
-    # Student name (highlighted)
-    draw.text((width//2, y_pos), name.upper(), fill=colors['primary'], font=font_name, anchor="mm")
-    y_pos += 80
+    # Signature label (signature image is pasted above it)
+    draw.text((_SIG_X + 100, _SIG_Y + 70), "Director", fill='black', font=font_small, anchor="mm")
+    draw.line([(_SIG_X, _SIG_Y + 65), (_SIG_X + 200, _SIG_Y + 65)], fill='black', width=1)
     
-    # Achievement text
-    draw.text((width//2, y_pos), "has successfully completed the program", fill='black', font=font_text, anchor="mm")
-    y_pos += 50
+    # Seal label (seal image is pasted above it)
+    draw.text((_SEAL_X + 60, _SEAL_Y + 130), "Official Seal", fill='black', font=font_small, anchor="mm")
+    
+    return img
+
+# Bump to force regeneration of existing certificate files after layout changes
+_RENDER_VERSION = "v1"
+
+def create_complete_certificate(cert_data, cert_type="authentic", output_dir="complete_certificates"):
+    """Create a complete certificate with all elements."""
+    reg_no, name, institution, degree, year, notes = cert_data
+    
+    # Create output directory
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Seed decorative randomness per record so the same record always renders the same
+    rng = random.Random(f"{reg_no}|{cert_type}")
+    
+    # Build seal and signature first: they decide authenticity and are cheap (seals are cached)
+    seal_img, seal_offset, seal_authentic = create_institutional_seal(institution, reg_no, rng=rng)
+    sig_img, sig_offset, sig_authentic = create_signature("Director", authentic=(cert_type == "authentic"), rng=rng)
+    
+    # Determine certificate authenticity
+    is_authentic = (cert_type == "authentic" and seal_authentic and sig_authentic)
+    
+    # Fingerprint everything that affects the pixels; skip rendering if the existing
+    # file already carries the same fingerprint in its PNG metadata
+    issue_date = datetime.now().strftime("%B %Y")
+    fingerprint = hashlib.blake2b(
+        f"{reg_no}|{name}|{institution}|{degree}|{year}|{cert_type}|{issue_date}|{_RENDER_VERSION}".encode(),
+        digest_size=8
+    ).hexdigest()
+    filename = f"{reg_no}_{name.replace(' ', '_')}_{cert_type}.png"
+    filepath = os.path.join(output_dir, filename)
+    if _stored_fingerprint(filepath) == fingerprint:
+        return filepath, is_authentic
+    
+    # Start from the cached background for this institution
+    base = _TEMPLATE_BASES.get(institution)
+    if base is None:
+        base = _TEMPLATE_BASES[institution] = _build_base(institution)
+    img = base.copy()
+    draw = ImageDraw.Draw(img)
+    
+    # Get colors for this institution
+    colors = get_institution_colors(institution)
+    
+    # Load fonts
+    font_subtitle = _font(24)
+    font_text = _font(20)
+    font_small = _font(16)
+    font_name = _font(36)
+    
+    # Student name (highlighted)
+    draw.text((_CX, 360), name.upper(), fill=colors['primary'], font=font_name, anchor="mm")
     
     # Degree (highlighted)
-    draw.text((width//2, y_pos), degree, fill=colors['primary'], font=font_subtitle, anchor="mm")
-    y_pos += 60
+    draw.text((_CX, 490), degree, fill=colors['primary'], font=font_subtitle, anchor="mm")
     
     # Institution
-    draw.text((width//2, y_pos), f"from {institution}", fill='black', font=font_text, anchor="mm")
-    y_pos += 40
+    draw.text((_CX, 550), f"from {institution}", fill='black', font=font_text, anchor="mm")
     
     # Year
-    draw.text((width//2, y_pos), f"in the year {year}", fill='black', font=font_text, anchor="mm")
-    y_pos += 80
+    draw.text((_CX, 590), f"in the year {year}", fill='black', font=font_text, anchor="mm")
     
     # Registration number
     reg_text = f"Registration Number: {reg_no}"
-    draw.text((width//2, y_pos), reg_text, fill='black', font=font_small, anchor="mm")
-    y_pos += 30
+    draw.text((_CX, 670), reg_text, fill='black', font=font_small, anchor="mm")
     
     # Date of issue
-    from datetime import datetime
-    issue_date = datetime.now().strftime("%B %Y")
-    draw.text((width//2, y_pos), f"Date of Issue: {issue_date}", fill='black', font=font_small, anchor="mm")
-    
-    # Add institutional seal (bottom right)
-    seal_img, seal_authentic = create_institutional_seal(institution, reg_no)
-    seal_x, seal_y = width - 200, height - 180
-    img.paste(seal_img, (seal_x, seal_y), seal_img)
-    
-    # Add signature (bottom left)
-    sig_img, sig_authentic = create_signature("Director", authentic=(cert_type == "authentic"))
-    sig_x, sig_y = 100, height - 120
-    img.paste(sig_img, (sig_x, sig_y), sig_img)
-    
-    # Add signature label
-    draw.text((sig_x + 100, sig_y + 70), "Director", fill='black', font=font_small, anchor="mm")
-    draw.line([(sig_x, sig_y + 65), (sig_x + 200, sig_y + 65)], fill='black', width=1)
+    draw.text((_CX, 700), f"Date of Issue: {issue_date}", fill='black', font=font_small, anchor="mm")
     
-    # Add seal label
-    draw.text((seal_x + 60, seal_y + 130), "Official Seal", fill='black', font=font_small, anchor="mm")
-    
-    # Determine certificate authenticity
-    is_authentic = (cert_type == "authentic" and seal_authentic and sig_authentic)
+    # Add institutional seal (bottom right) and signature (bottom left); both are
+    # trimmed to their drawn pixels so alpha blending touches less
+    dx, dy = seal_offset
+    img.paste(seal_img, (_SEAL_X + dx, _SEAL_Y + dy), seal_img)
+    dx, dy = sig_offset
+    img.paste(sig_img, (_SIG_X + dx, _SIG_Y + dy), sig_img)
     
     # Save certificate
-    filename = f"{reg_no}_{name.replace(' ', '_')}_{cert_type}.png"
-    filepath = os.path.join(output_dir, filename)
-    img.save(filepath)
+    _write_png(img, filepath, fingerprint)
     
     return filepath, is_authentic
 
+def _render_one(job):
+    """Pool worker: render one (cert_data, cert_type) job."""
+    cert_data, cert_type = job
+    filepath, is_authentic = create_complete_certificate(cert_data, cert_type)
+    return cert_data, cert_type, filepath, is_authentic
+
 def generate_certificate_dataset():
     """Generate complete certificate dataset with both authentic and tampered versions."""
     print("🎓 Generating Complete Certificate Dataset...")
@@ -300,39 +416,36 @@ def generate_certificate_dataset():
     
     print(f"Found {len(certificates)} certificate records in database")
     
+    # Authentic version for every record, tampered version for ~30% of them
+    jobs = []
+    for cert_data in certificates:
+        jobs.append((cert_data, "authentic"))
+        if random.random() < 0.3:
+            jobs.append((cert_data, "tampered"))
+    
     generated_files = []
     
-    for i, cert_data in enumerate(certificates):
-        reg_no, name, institution, degree, year, notes = cert_data
-        
-        print(f"\n📜 Generating certificate {i+1}/{len(certificates)}: {name}")
-        print(f"   Registration: {reg_no}")
-        print(f"   Institution: {institution}")
-        print(f"   Degree: {degree}")
-        print(f"   Year: {year}")
-        
-        # Generate authentic version
-        auth_file, is_auth = create_complete_certificate(cert_data, "authentic")
-        generated_files.append({
-            'file': auth_file,
-            'type': 'authentic',
-            'reg_no': reg_no,
-            'name': name,
-            'authentic': is_auth
-        })
-        print(f"   ✅ Authentic: {auth_file}")
-        
-        # Generate tampered version (30% chance)
-        if random.random() < 0.3:
-            fake_file, is_fake = create_complete_certificate(cert_data, "tampered")
+    # Render certificates in parallel; each one is independent CPU-bound PIL work
+    with multiprocessing.Pool(os.cpu_count()) as pool:
+        for cert_data, cert_type, filepath, is_auth in pool.imap(_render_one, jobs, chunksize=4):
+            reg_no, name, institution, degree, year, notes = cert_data
             generated_files.append({
-                'file': fake_file,
-                'type': 'tampered',
+                'file': filepath,
+                'type': cert_type,
                 'reg_no': reg_no,
                 'name': name,
-                'authentic': is_fake
+                'authentic': is_auth
             })
-            print(f"   ⚠️ Tampered: {fake_file}")
+            
+            if cert_type == "authentic":
+                print(f"\n📜 Generated certificate: {name}")
+                print(f"   Registration: {reg_no}")
+                print(f"   Institution: {institution}")
+                print(f"   Degree: {degree}")
+                print(f"   Year: {year}")
+                print(f"   ✅ Authentic: {filepath}")
+            else:
+                print(f"   ⚠️ Tampered: {filepath}")
     
     print(f"\n🎉 Certificate Generation Complete!")
     print(f"📊 Generated {len(generated_files)} certificate images")
@@ -3,11 +3,79 @@ Generate a dummy dataset of seals, stamps, and signatures aligned with our certi
 """
 
 import os
+import io
 import sqlite3
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 import random
+import multiprocessing
+import functools
+from pathlib import Path
 import numpy as np
 
+def _try_load(face, size):
+    """Load a TrueType font, falling back to the default font if not available."""
+    try:
+        return ImageFont.truetype(face, size)
+    except:
+        return ImageFont.load_default()
+
+# Fonts are parsed once per process instead of once per image
+_FONT_LARGE = _try_load("arial.ttf", 16)
+_FONT_SMALL = _try_load("arial.ttf", 12)
+_FONT_SIG = _try_load("arial.ttf", 20)
+
+# Choice pools for seal and signature variations
+_REAL_COLORS = ('#1f4e79', '#d32f2f', '#388e3c', '#7b1fa2')  # Blue, Red, Green, Purple
+_FAKE_COLORS = ('#ffff00', '#ff6600', '#ff00ff', '#00ffff', '#000000')  # Yellow, Orange, Magenta, Cyan, Black
+_SUSPICIOUS = ("COPY", "DUPLICATE", "SAMPLE", "NOT VALID", "FAKE")
+_WRONG_YEARS = ("1999", "2050", "????", "")
+_REAL_SIG_TEMPLATES = ("Dr. {first} Director", "Registrar Office", "Academic Head", "Principal")
+_FAKE_SIG_TEXTS = ("SCRIBBLE", "FAKE SIGN", "XXX", "INVALID")
+
+# Blank 224x224 white canvas, copied for every image
+_BLANK_CANVAS = Image.new('RGB', (224, 224), 'white')
+
+# Dataset output folders
+_DIRS = tuple(Path(p) for p in (
+    'seal_dataset/train/real',
+    'seal_dataset/train/fake',
+    'seal_dataset/val/real',
+    'seal_dataset/val/fake'
+))
+
+# Outer (width 4) and inner (width 2) rings of the real seal, precomputed once
+_yy, _xx = np.ogrid[:224, :224]
+_RADIUS = np.hypot(_yy - 112, _xx - 112)
+_RING_MASK = ((_RADIUS >= 88.5) & (_RADIUS <= 92.5)) | ((_RADIUS >= 80.5) & (_RADIUS <= 82.5))
+
+@functools.lru_cache(maxsize=64)
+def _label(text, font):
+    """Rasterise a centred ("mm") label once; returns its 1-bit mask and offset from the anchor."""
+    left, top, right, bottom = font.getbbox(text, anchor="mm")
+    # Pad the box so glyph overhangs outside the advance box are not clipped
+    left, top, right, bottom = left - 4, top - 4, right + 4, bottom + 4
+    mask = Image.new('L', (right - left, bottom - top), 0)
+    draw = ImageDraw.Draw(mask)
+    draw.fontmode = "1"  # aliased text, no per-glyph alpha blending
+    draw.text((-left, -top), text, fill=255, font=font, anchor="mm")
+    return mask, (left, top)
+
+def _paste_label(img, xy, text, fill, font):
+    """Stamp a cached label onto img centred at xy, like draw.text(..., anchor="mm")."""
+    mask, (dx, dy) = _label(text, font)
+    img.paste(fill, (xy[0] + dx, xy[1] + dy), mask)
+
+def _save_png(img, path):
+    """Encode an uncompressed PNG in memory and write it with a single write call."""
+    buf = io.BytesIO()
+    img.save(buf, format='PNG', optimize=False, compress_level=0)
+    with open(path, 'wb') as f:
+        f.write(buf.getbuffer())
+
+def _image_filename(kind, institute_name, image_id):
+    """Deterministic filename for one image, e.g. real_seal_city_college_3.png."""
+    return f"{kind}_{institute_name.replace(' ', '_').lower()}_{image_id}.png"
+
 def get_institutes_from_db():
     """Get institute names from the certificate database."""
     conn = sqlite3.connect('certs.db')
@@ -19,67 +87,54 @@ def get_institutes_from_db():
 
 def create_dataset_structure():
     """Create the dataset folder structure."""
-    folders = [
-        'seal_dataset/train/real',
-        'seal_dataset/train/fake',
-        'seal_dataset/val/real',
-        'seal_dataset/val/fake'
-    ]
+    if all(p.is_dir() for p in _DIRS):
+        return
     
-    for folder in folders:
-        os.makedirs(folder, exist_ok=True)
+    for p in _DIRS:
+        p.mkdir(parents=True, exist_ok=True)
     print("Dataset folder structure created!")
 
 def generate_real_seal(institute_name, image_id, folder_path):
     """Generate a realistic seal for a given institute."""
-    # Create 224x224 image
-    img = Image.new('RGB', (224, 224), 'white')
-    draw = ImageDraw.Draw(img)
-    
     # Seal colors (professional)
-    colors = ['#1f4e79', '#d32f2f', '#388e3c', '#7b1fa2']  # Blue, Red, Green, Purple
-    seal_color = random.choice(colors)
+    seal_color = random.choice(_REAL_COLORS)
     
-    # Draw outer circle
-    draw.ellipse([20, 20, 204, 204], outline=seal_color, width=4)
-    draw.ellipse([30, 30, 194, 194], outline=seal_color, width=2)
+    # Create 224x224 image with the outer circles painted through the ring mask
+    arr = np.array(_BLANK_CANVAS)
+    arr[_RING_MASK] = ImageColor.getrgb(seal_color)
+    img = Image.fromarray(arr)
+    draw = ImageDraw.Draw(img)
     
-    # Try to load a font, fallback to default if not available
-    try:
-        font_large = ImageFont.truetype("arial.ttf", 16)
-        font_small = ImageFont.truetype("arial.ttf", 12)
-    except:
-        font_large = ImageFont.load_default()
-        font_small = ImageFont.load_default()
+    font_large = _FONT_LARGE
+    font_small = _FONT_SMALL
     
     # Institute name at top (curved effect simulation)
     institute_short = institute_name.replace("Institute", "INST").replace("University", "UNIV")
-    draw.text((112, 50), institute_short, fill=seal_color, font=font_large, anchor="mm")
+    _paste_label(img, (112, 50), institute_short, seal_color, font_large)
     
     # Official seal text in center
-    draw.text((112, 90), "OFFICIAL", fill=seal_color, font=font_small, anchor="mm")
-    draw.text((112, 110), "SEAL", fill=seal_color, font=font_small, anchor="mm")
+    _paste_label(img, (112, 90), "OFFICIAL", seal_color, font_small)
+    _paste_label(img, (112, 110), "SEAL", seal_color, font_small)
     
     # Year at bottom
     current_year = "2024"
-    draw.text((112, 150), f"EST. {current_year}", fill=seal_color, font=font_small, anchor="mm")
+    _paste_label(img, (112, 150), f"EST. {current_year}", seal_color, font_small)
     
     # Add some authenticity marks
     draw.ellipse([100, 130, 124, 154], outline=seal_color, width=1)
     
     # Save image
-    filename = f"real_seal_{institute_name.replace(' ', '_').lower()}_{image_id}.png"
-    img.save(os.path.join(folder_path, filename))
+    filename = _image_filename('real_seal', institute_name, image_id)
+    _save_png(img, os.path.join(folder_path, filename))
     return filename
 
 def generate_fake_seal(institute_name, image_id, folder_path):
     """Generate a fake/tampered seal."""
-    img = Image.new('RGB', (224, 224), 'white')
+    img = _BLANK_CANVAS.copy()
     draw = ImageDraw.Draw(img)
     
     # Fake colors (unprofessional)
-    fake_colors = ['#ffff00', '#ff6600', '#ff00ff', '#00ffff', '#000000']  # Yellow, Orange, Magenta, Cyan, Black
-    seal_color = random.choice(fake_colors)
+    seal_color = random.choice(_FAKE_COLORS)
     
     # Distorted/broken circles
     if random.choice([True, False]):
@@ -90,12 +145,8 @@ def generate_fake_seal(institute_name, image_id, folder_path):
         # Irregular shape
         draw.polygon([(25, 50), (180, 30), (200, 180), (40, 190), (20, 100)], outline=seal_color, width=3)
     
-    try:
-        font_large = ImageFont.truetype("arial.ttf", 16)
-        font_small = ImageFont.truetype("arial.ttf", 12)
-    except:
-        font_large = ImageFont.load_default()
-        font_small = ImageFont.load_default()
+    font_large = _FONT_LARGE
+    font_small = _FONT_SMALL
     
     # Wrong/misspelled institute name
     fake_names = [
@@ -107,65 +158,71 @@ def generate_fake_seal(institute_name, image_id, folder_path):
     ]
     fake_name = random.choice(fake_names)
     
-    draw.text((112, 50), fake_name[:20], fill=seal_color, font=font_large, anchor="mm")
+    _paste_label(img, (112, 50), fake_name[:20], seal_color, font_large)
     
     # Suspicious text
-    suspicious_texts = ["COPY", "DUPLICATE", "SAMPLE", "NOT VALID", "FAKE"]
-    draw.text((112, 90), random.choice(suspicious_texts), fill=seal_color, font=font_small, anchor="mm")
+    _paste_label(img, (112, 90), random.choice(_SUSPICIOUS), seal_color, font_small)
     
     # Wrong year or no year
-    wrong_years = ["1999", "2050", "????", ""]
-    draw.text((112, 150), f"EST. {random.choice(wrong_years)}", fill=seal_color, font=font_small, anchor="mm")
+    _paste_label(img, (112, 150), f"EST. {random.choice(_WRONG_YEARS)}", seal_color, font_small)
     
     # Save image
-    filename = f"fake_seal_{institute_name.replace(' ', '_').lower()}_{image_id}.png"
-    img.save(os.path.join(folder_path, filename))
+    filename = _image_filename('fake_seal', institute_name, image_id)
+    _save_png(img, os.path.join(folder_path, filename))
     return filename
 
 def generate_signature(is_real, institute_name, image_id, folder_path):
     """Generate signature images."""
-    img = Image.new('RGB', (224, 224), 'white')
+    img = _BLANK_CANVAS.copy()
     draw = ImageDraw.Draw(img)
     
-    try:
-        font = ImageFont.truetype("arial.ttf", 20)
-    except:
-        font = ImageFont.load_default()
+    font = _FONT_SIG
     
     if is_real:
         # Real signatures - cursive-like
-        signatures = [
-            f"Dr. {institute_name.split()[0]} Director",
-            "Registrar Office",
-            "Academic Head",
-            "Principal"
-        ]
-        signature_text = random.choice(signatures)
+        signature_text = random.choice(_REAL_SIG_TEMPLATES).format(first=institute_name.split()[0])
         
         # Draw signature-like curves
         points = [(50, 120), (80, 100), (120, 110), (160, 95), (180, 105)]
         draw.line(points, fill='#000080', width=2)
         
-        draw.text((112, 140), signature_text, fill='#000080', font=font, anchor="mm")
+        _paste_label(img, (112, 140), signature_text, '#000080', font)
         prefix = "real"
     else:
         # Fake signatures - scribbles or block text
-        fake_signatures = ["SCRIBBLE", "FAKE SIGN", "XXX", "INVALID"]
-        signature_text = random.choice(fake_signatures)
+        signature_text = random.choice(_FAKE_SIG_TEXTS)
         
-        # Draw messy scribbles
-        for _ in range(5):
-            start_x, start_y = random.randint(50, 150), random.randint(100, 130)
-            end_x, end_y = start_x + random.randint(-30, 30), start_y + random.randint(-20, 20)
-            draw.line([(start_x, start_y), (end_x, end_y)], fill='red', width=2)
+        # Draw messy scribbles: sample all five (x0, y0, dx, dy) segments in one call
+        rng = np.random.default_rng(random.getrandbits(32))
+        segs = rng.integers([50, 100, -30, -20], [151, 131, 31, 21], size=(5, 4))
+        segs[:, 2:] += segs[:, :2]
+        for seg in segs.tolist():
+            draw.line(seg, fill='red', width=2)
         
-        draw.text((112, 140), signature_text, fill='red', font=font, anchor="mm")
+        _paste_label(img, (112, 140), signature_text, 'red', font)
         prefix = "fake"
     
-    filename = f"{prefix}_signature_{institute_name.replace(' ', '_').lower()}_{image_id}.png"
-    img.save(os.path.join(folder_path, filename))
+    filename = _image_filename(f"{prefix}_signature", institute_name, image_id)
+    _save_png(img, os.path.join(folder_path, filename))
     return filename
 
+def _render_one(task):
+    """Pool worker: render one (kind, institute, image_id, folder) task."""
+    kind, institute, image_id, folder_path = task
+    
+    # Independent, reproducible random stream per task: image ids restart for every
+    # split and kind, so seed on all three. String seeds are hashed deterministically
+    # (unlike hash() of a str tuple), so output does not depend on the worker.
+    random.seed(f"{folder_path}|{kind}|{image_id}")
+    
+    if kind == 'real_seal':
+        filename = generate_real_seal(institute, image_id, folder_path)
+    elif kind == 'fake_seal':
+        filename = generate_fake_seal(institute, image_id, folder_path)
+    else:
+        filename = generate_signature(kind == 'real_signature', institute, image_id, folder_path)
+    return kind, filename
+
 def generate_complete_dataset():
     """Generate the complete seal dataset."""
     print("Generating seal dataset...")
@@ -186,39 +243,51 @@ def generate_complete_dataset():
     
     print(f"Found {len(institutes)} institutes: {institutes}")
     
-    # Generate training data
-    for split in ['train', 'val']:
-        images_per_class = 30 if split == 'train' else 10
-        
-        print(f"\nGenerating {split} dataset...")
-        
+    # Pick the institute for every image in one vectorized draw; the fixed seed
+    # keeps filenames stable so reruns can skip images already on disk
+    split_sizes = {'train': 30, 'val': 10}
+    total_images = 2 * sum(split_sizes.values())
+    picks = iter(np.random.default_rng(0).choice(np.asarray(institutes, dtype=object), size=total_images))
+    
+    # Build one task per image; every image is independent.
+    # Images already on disk from an earlier run are skipped.
+    tasks = []
+    skipped = 0
+    for split, images_per_class in split_sizes.items():
         # Real seals and signatures
         real_folder = f'seal_dataset/{split}/real'
-        for i in range(images_per_class):
-            institute = random.choice(institutes)
-            
-            # Generate seals (70% of images)
-            if i < images_per_class * 0.7:
-                filename = generate_real_seal(institute, i, real_folder)
-                print(f"Generated real seal: {filename}")
-            else:
-                # Generate signatures (30% of images)
-                filename = generate_signature(True, institute, i, real_folder)
-                print(f"Generated real signature: {filename}")
+        existing = {entry.name for entry in os.scandir(real_folder)}
+        for i, institute in zip(range(images_per_class), picks):
+            # Generate seals (70% of images), signatures (30% of images)
+            kind = 'real_seal' if i < images_per_class * 0.7 else 'real_signature'
+            if _image_filename(kind, institute, i) in existing:
+                skipped += 1
+                continue
+            tasks.append((kind, institute, i, real_folder))
         
         # Fake seals and signatures  
         fake_folder = f'seal_dataset/{split}/fake'
-        for i in range(images_per_class):
-            institute = random.choice(institutes)
-            
-            # Generate fake seals (70% of images)
-            if i < images_per_class * 0.7:
-                filename = generate_fake_seal(institute, i, fake_folder)
-                print(f"Generated fake seal: {filename}")
-            else:
-                # Generate fake signatures (30% of images)
-                filename = generate_signature(False, institute, i, fake_folder)
-                print(f"Generated fake signature: {filename}")
+        existing = {entry.name for entry in os.scandir(fake_folder)}
+        for i, institute in zip(range(images_per_class), picks):
+            # Generate fake seals (70% of images), fake signatures (30% of images)
+            kind = 'fake_seal' if i < images_per_class * 0.7 else 'fake_signature'
+            if _image_filename(kind, institute, i) in existing:
+                skipped += 1
+                continue
+            tasks.append((kind, institute, i, fake_folder))
+    
+    # Render across all cores
+    with multiprocessing.Pool(os.cpu_count()) as pool:
+        filenames = list(pool.imap_unordered(_render_one, tasks, chunksize=8))
+    
+    # One summary line per kind instead of one print per image
+    counts = {}
+    for kind, _ in filenames:
+        counts[kind] = counts.get(kind, 0) + 1
+    for kind, count in counts.items():
+        print(f"Generated {count} {kind.replace('_', ' ')} images")
+    if skipped:
+        print(f"Skipped {skipped} images that already exist")
     
     print("\n✅ Seal dataset generation completed!")
     print("Dataset structure:")
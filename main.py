@@ -1,11 +1,17 @@
 import streamlit as st
+import io
 import os
 import json
+import sqlite3
 import tempfile
 from pathlib import Path
 from PIL import Image
+import pandas as pd
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -68,6 +74,19 @@ except ImportError:
     logger.warning("ViT classifier not available - using demo mode")
     VIT_AVAILABLE = False
 
+# Faster JSON encoding for the downloadable report when orjson is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Settings live in an imported module so they are read once per process
+from settings import DB_PATH, API_KEY
+
+# Sample OCR results used by OCR demo mode (built once, on import)
+from demo_data import DEMO_CERTIFICATES
+
 # Page configuration
 st.set_page_config(
     page_title="Certificate Verification System",
@@ -75,30 +94,92 @@ st.set_page_config(
     layout="wide"
 )
 
-def init_session_state():
-    """Initialize session state variables."""
-    if 'verification_result' not in st.session_state:
-        st.session_state.verification_result = None
-    if 'ocr_result' not in st.session_state:
-        st.session_state.ocr_result = None
-    if 'seal_result' not in st.session_state:
-        st.session_state.seal_result = None
-    if 'cropped_seals' not in st.session_state:
-        st.session_state.cropped_seals = None
-    if 'uploaded_file' not in st.session_state:
-        st.session_state.uploaded_file = None
+@st.cache_resource
+def get_conn(path=DB_PATH):
+    """Open one read-only SQLite connection per database path and share it across reruns."""
+    # mode=ro refuses writes and never creates an empty database file
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
 
-def display_verification_result(result, seal_result=None):
-    """Display the verification result in a structured format."""
+@st.cache_data(ttl=60)
+def _cert_count(path, mtime):
+    """Count certificates in the database; mtime keys the cache so edits to the file refresh it."""
+    return get_conn(path).execute("SELECT COUNT(*) FROM certificates").fetchone()[0]
+
+@st.cache_resource
+def get_ocr_client():
+    """Build the OCR client once so its HTTP session is reused across reruns."""
+    return OCRClient()
+
+@st.cache_resource
+def get_verifier():
+    """Build the certificate verifier once, sharing the cached database connection."""
+    conn = get_conn(DB_PATH) if os.path.exists(DB_PATH) else None
+    return CertificateVerifier(DB_PATH, conn=conn)
+
+@st.cache_resource
+def get_seal_detector():
+    """Build the seal detector once so its model stays loaded across reruns."""
+    return SealDetector()
+
+@st.cache_resource
+def get_vit_classifier():
+    """Build the ViT classifier once so its weights are loaded only once per process."""
+    return ViTSealClassifier()
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _preview_image(file_id, _upload):
+    """Decode and shrink an upload for display; cached by file_id so reruns skip the read and resize."""
+    image = Image.open(io.BytesIO(_upload.getvalue()))
+    # Preview at display size rather than shipping the full-resolution scan
+    image.thumbnail((800, 800), Image.Resampling.BILINEAR)
+    return image
+
+@st.cache_resource
+def get_executor():
+    """Shared worker threads for network-bound calls such as OCR."""
+    return ThreadPoolExecutor(max_workers=2)
+
+def _submit_with_ctx(fn, *args):
+    """Submit fn to the shared executor with this script run's context attached to the worker,
+    so Streamlit caches (st.cache_data/st.cache_resource) work on the worker thread."""
+    ctx = get_script_run_ctx()
     
-    # Final Decision Card
-    st.subheader("🎯 Final Verification Decision")
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
     
-    # Determine final decision based on OCR and Seal results
+    return get_executor().submit(run)
+
+def _warm_seal_models():
+    """Load the seal models so they are ready by the time seal verification starts."""
+    try:
+        seal_detector = get_seal_detector()
+        if hasattr(seal_detector, 'load_model'):
+            seal_detector.load_model()
+    except Exception as e:
+        # Any real failure is reported again by the seal verification step
+        logger.warning(f"Seal detector warm-up failed: {e}")
+
+class OCRFailed(Exception):
+    """Raised from run_ocr so that failed OCR results are not cached."""
+    
+    def __init__(self, result):
+        super().__init__(result.get('error', 'Unknown error'))
+        self.result = result
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def run_ocr(file_id, language, overlay, _file_bytes):
+    """OCR an upload once per (file_id, language, overlay); the bytes themselves are not hashed."""
+    result = get_ocr_client().extract_text_from_bytes(_file_bytes, language=language, overlay=overlay)
+    if not result['success']:
+        raise OCRFailed(result)
+    return result
+
+def compute_verdict(result, seal_result=None):
+    """Combine the OCR and seal results into the final security-first decision."""
     ocr_status = "Pass" if result['decision'] == 'AUTHENTIC' else "Fail"
-    seal_status = seal_result.get('status', 'Unknown') if seal_result else 'Unknown'
+    seal_status = seal_result.get('status', 'Unknown') if seal_result else 'Not Checked'
     
-    # Improved final decision logic: Security-first approach
     # CRITICAL: If seals are detected as fake, the certificate MUST be rejected
     ocr_confidence = result.get('final_score', 0)
     seal_confidence = seal_result.get('confidence', 0) if seal_result else 0
@@ -107,30 +188,79 @@ def display_verification_result(result, seal_result=None):
     both_pass = (ocr_status == "Pass" and seal_status == "Pass")
     
     # CRITICAL SECURITY CHECK: If fake seals detected with high confidence, REJECT
-    fake_seals_detected = False
+    rejection_reason = None
     if seal_result and seal_result.get('details'):
         fake_count = seal_result['details'].get('fake_seals', 0)
-        total_seals = seal_result['details'].get('total_seals', 0)
         if fake_count > 0 and seal_confidence > 0.7:  # High confidence fake detection
-            fake_seals_detected = True
+            rejection_reason = f"High confidence fake seal detection ({seal_confidence:.1%})"
     
     # REJECT if fake seals detected with high confidence
-    if fake_seals_detected:
+    if rejection_reason:
         final_decision = "Fake"
-        rejection_reason = f"High confidence fake seal detection ({seal_confidence:.1%})"
-    else:
-        # Only pass if both OCR and seals pass, or if no seal verification was performed
-        if seal_result is None:  # No seal verification
-            final_decision = "Real" if (ocr_status == "Pass" and ocr_confidence > 0.8) else "Fake"
-        else:  # Seal verification was performed
-            final_decision = "Real" if both_pass else "Fake"
+    elif seal_result is None:  # No seal verification
+        final_decision = "Real" if (ocr_status == "Pass" and ocr_confidence > 0.8) else "Fake"
+    else:  # Seal verification was performed
+        final_decision = "Real" if both_pass else "Fake"
+    
+    return {
+        'ocr_status': ocr_status,
+        'seal_status': seal_status,
+        'final_decision': final_decision,
+        'rejection_reason': rejection_reason,
+        'overall_confidence': (result['final_score'] + seal_result.get('confidence', 0.5)) / 2 if seal_result else result['final_score']
+    }
+
+def init_session_state():
+    """Initialize session state variables."""
+    if 'verification_result' not in st.session_state:
+        st.session_state.verification_result = None
+    if 'ocr_result' not in st.session_state:
+        st.session_state.ocr_result = None
+    if 'seal_result' not in st.session_state:
+        st.session_state.seal_result = None
+    if 'cropped_seals' not in st.session_state:
+        st.session_state.cropped_seals = None
+    if 'uploaded_file' not in st.session_state:
+        st.session_state.uploaded_file = None
+    if 'report_json' not in st.session_state:
+        st.session_state.report_json = None
+    if 'verdict' not in st.session_state:
+        st.session_state.verdict = None
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _seal_thumb(path, mtime_ns, size):
+    """Encode a cropped seal as a small PNG thumbnail; keyed on mtime/size too, since crop names get reused."""
+    image = Image.open(path)
+    image.thumbnail((256, 256))
+    buf = io.BytesIO()
+    image.save(buf, format='PNG')
+    return buf.getvalue()
+
+# st.fragment needs Streamlit >= 1.33; older versions render the results inline
+_fragment = getattr(st, 'fragment', None) or (lambda func: func)
+
+@_fragment
+def results_fragment(result, seal_result=None):
+    """Render the results as a fragment so its own interactions do not rerun the whole app."""
+    display_verification_result(result, seal_result)
+
+def display_verification_result(result, seal_result=None):
+    """Display the verification result in a structured format."""
+    
+    # Final Decision Card
+    st.subheader("🎯 Final Verification Decision")
+    
+    # Final decision computed once per verification
+    verdict = st.session_state.verdict or compute_verdict(result, seal_result)
+    ocr_status = verdict['ocr_status']
+    final_decision = verdict['final_decision']
     
     # Display final decision with color coding and reason
     if final_decision == "Real":
         st.success("🎉 **CERTIFICATE VERIFIED AS AUTHENTIC** ✅")
     else:
-        if 'rejection_reason' in locals():
-            st.error(f"❌ **CERTIFICATE VERIFICATION FAILED** ❌\n\n**Reason**: {rejection_reason}")
+        if verdict['rejection_reason']:
+            st.error(f"❌ **CERTIFICATE VERIFICATION FAILED** ❌\n\n**Reason**: {verdict['rejection_reason']}")
         else:
             st.error("❌ **CERTIFICATE VERIFICATION FAILED** ❌")
     
@@ -141,8 +271,7 @@ def display_verification_result(result, seal_result=None):
         st.metric("Final Decision", final_decision)
     
     with col2:
-        combined_confidence = (result['final_score'] + seal_result.get('confidence', 0.5)) / 2 if seal_result else result['final_score']
-        st.metric("Overall Confidence", f"{combined_confidence:.2%}")
+        st.metric("Overall Confidence", f"{verdict['overall_confidence']:.2%}")
     
     with col3:
         reg_no = result['registration_no'] or 'Not Found'
@@ -183,6 +312,8 @@ def display_verification_result(result, seal_result=None):
             if seal_result:
                 if seal_result.get('status') == 'Pass':
                     st.success("✅ PASS")
+                elif seal_result.get('status') == 'Skipped':
+                    st.warning("⏭️ SKIPPED")
                 else:
                     st.error("❌ FAIL")
             else:
@@ -238,8 +369,16 @@ def display_verification_result(result, seal_result=None):
         # Field scores
         if result['field_scores']:
             st.subheader("🎯 Field Comparison Scores")
-            for field, score in result['field_scores'].items():
-                st.progress(score, text=f"{field.title()}: {score:.1%}")
+            # One table widget instead of one progress bar per field
+            scores = pd.DataFrame({
+                'Field': [field.title() for field in result['field_scores']],
+                'Score': [score * 100 for score in result['field_scores'].values()]
+            })
+            st.dataframe(
+                scores,
+                column_config={'Score': st.column_config.ProgressColumn('Score', min_value=0, max_value=100, format='%.1f%%')},
+                hide_index=True
+            )
         
         # Reasons
         st.subheader("💡 Analysis Reasons")
@@ -258,41 +397,15 @@ def display_verification_result(result, seal_result=None):
             cols = st.columns(min(3, len(st.session_state.cropped_seals)))
             for i, seal_info in enumerate(st.session_state.cropped_seals):
                 with cols[i % 3]:
-                    st.image(seal_info['pil_image'], caption=f"Seal {i+1} ({seal_info['method']} detection)")
+                    st.image(seal_info['thumb'], caption=f"Seal {i+1} ({seal_info['method']} detection)")
 
 def create_verification_report(result, seal_result=None):
     """Create a downloadable verification report."""
     
-    # Determine final decision with improved logic
-    ocr_status = "Pass" if result['decision'] == 'AUTHENTIC' else "Fail"
-    seal_status = seal_result.get('status', 'Not Checked') if seal_result else 'Not Checked'
-    
-    # Apply same security-first decision logic as above
-    ocr_confidence = result.get('final_score', 0)
-    seal_confidence = seal_result.get('confidence', 0) if seal_result else 0
-    
-    # Security-first decision criteria:
-    both_pass = (ocr_status == "Pass" and seal_status == "Pass")
-    
-    # CRITICAL SECURITY CHECK: If fake seals detected with high confidence, REJECT
-    fake_seals_detected = False
-    rejection_reason = None
-    if seal_result and seal_result.get('details'):
-        fake_count = seal_result['details'].get('fake_seals', 0)
-        total_seals = seal_result['details'].get('total_seals', 0)
-        if fake_count > 0 and seal_confidence > 0.7:  # High confidence fake detection
-            fake_seals_detected = True
-            rejection_reason = f"High confidence fake seal detection ({seal_confidence:.1%})"
-    
-    # REJECT if fake seals detected with high confidence
-    if fake_seals_detected:
-        final_decision = "Fake"
-    else:
-        # Only pass if both OCR and seals pass, or if no seal verification was performed
-        if seal_result is None:  # No seal verification
-            final_decision = "Real" if (ocr_status == "Pass" and ocr_confidence > 0.8) else "Fake"
-        else:  # Seal verification was performed
-            final_decision = "Real" if both_pass else "Fake"
+    # Final decision computed once per verification
+    verdict = st.session_state.verdict or compute_verdict(result, seal_result)
+    final_decision = verdict['final_decision']
+    ocr_status = verdict['ocr_status']
     
     report = {
         'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
@@ -312,11 +425,13 @@ def create_verification_report(result, seal_result=None):
         'summary': {
             'final_decision': final_decision,
             'ocr_status': ocr_status,
-            'seal_status': seal_status,
-            'overall_confidence': (result['final_score'] + seal_result.get('confidence', 0.5)) / 2 if seal_result else result['final_score']
+            'seal_status': verdict['seal_status'],
+            'overall_confidence': verdict['overall_confidence']
         }
     }
     
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
     return json.dumps(report, indent=2, ensure_ascii=False)
 
 def main():
@@ -336,8 +451,7 @@ def main():
         
         # OCR Status
         if OCR_AVAILABLE:
-            api_key = os.getenv('OCRSPACE_API_KEY')
-            if api_key:
+            if API_KEY:
                 st.success("✅ OCR API Available & Configured")
             else:
                 st.warning("⚠️ OCR API Available (No API Key)")
@@ -361,19 +475,14 @@ def main():
             st.warning("⚠️ AI Model - Demo Mode Only")
         
         # Database status
-        db_path = "certs.db"
+        db_path = DB_PATH
         if os.path.exists(db_path):
             st.success("✅ Database connected")
             
             # Show database stats
-            import sqlite3
             try:
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM certificates")
-                count = cursor.fetchone()[0]
+                count = _cert_count(db_path, os.path.getmtime(db_path))
                 st.info(f"📊 {count} certificates in database")
-                conn.close()
             except:
                 st.warning("⚠️ Database error")
         else:
@@ -426,7 +535,7 @@ def main():
         
         # OCR Demo Mode
         st.subheader("🔤 OCR Settings")
-        if not OCR_AVAILABLE or not os.getenv('OCRSPACE_API_KEY'):
+        if not OCR_AVAILABLE or not API_KEY:
             st.warning("⚠️ Using OCR Demo Mode")
             st.info("Configure API key for real OCR extraction")
             ocr_demo_mode = True
@@ -484,8 +593,7 @@ def main():
         
         # Display uploaded image
         if uploaded_file.type.startswith('image'):
-            image = Image.open(uploaded_file)
-            st.image(image, caption="Uploaded Certificate", use_container_width=True)
+            st.image(_preview_image(uploaded_file.file_id, uploaded_file), caption="Uploaded Certificate")
         
         # Verify button
         col1, col2, col3 = st.columns([1, 1, 2])
@@ -497,10 +605,12 @@ def main():
         
         with col2:
             if st.session_state.verification_result:
-                report_json = create_verification_report(st.session_state.verification_result, st.session_state.seal_result)
+                # Build the report once per verification, not on every rerun
+                if st.session_state.report_json is None:
+                    st.session_state.report_json = create_verification_report(st.session_state.verification_result, st.session_state.seal_result)
                 st.download_button(
                     "📥 Download Report",
-                    data=report_json,
+                    data=st.session_state.report_json,
                     file_name=f"verification_report_{int(time.time())}.json",
                     mime="application/json"
                 )
@@ -508,7 +618,7 @@ def main():
     # Display results
     if st.session_state.verification_result:
         st.markdown("---")
-        display_verification_result(st.session_state.verification_result, st.session_state.seal_result)
+        results_fragment(st.session_state.verification_result, st.session_state.seal_result)
         
         # Option to verify another certificate
         if st.button("🔄 Verify Another Certificate"):
@@ -517,6 +627,8 @@ def main():
             st.session_state.seal_result = None
             st.session_state.cropped_seals = None
             st.session_state.uploaded_file = None
+            st.session_state.report_json = None
+            st.session_state.verdict = None
             st.rerun()
 
 def verify_certificate(uploaded_file, language, use_overlay, ocr_demo_mode=False, enable_seal_verification=True, seal_demo_mode=False):
@@ -530,9 +642,8 @@ def verify_certificate(uploaded_file, language, use_overlay, ocr_demo_mode=False
         status_text.text("📤 Processing file...")
         progress_bar.progress(5)
         
-        # Read file data (reset file pointer first)
-        uploaded_file.seek(0)
-        file_bytes = uploaded_file.read()
+        # View the upload's buffer directly instead of copying it out with read()
+        file_bytes = uploaded_file.getbuffer()
         
         if len(file_bytes) == 0:
             st.error("❌ File appears to be empty or corrupted. Please try uploading again.")
@@ -540,79 +651,20 @@ def verify_certificate(uploaded_file, language, use_overlay, ocr_demo_mode=False
             status_text.empty()
             return
         
-        # Save uploaded file temporarily for seal detection
-        temp_image_path = None
-        if enable_seal_verification and uploaded_file.type.startswith('image'):
-            temp_dir = tempfile.mkdtemp()
-            temp_image_path = os.path.join(temp_dir, f"temp_cert_{int(time.time())}.{uploaded_file.name.split('.')[-1]}")
-            
-            with open(temp_image_path, 'wb') as f:
-                f.write(file_bytes)
-        
         if ocr_demo_mode:
             # Use demo OCR data
             status_text.text("🎮 Using demo OCR data...")
             progress_bar.progress(30)
             
-            # Sample OCR result based on filename or random selection
-            demo_certificates = {
-                "saksham": {
-                    'success': True,
-                    'extracted_text': '''CERTIFICATE OF COMPLETION
-                    
-This is to certify that
-
-SAKSHAM SHARMA
-
-has successfully completed the course
-
-B.Tech Computer Engineering
-
-from
-
-DevLabs Institute
-
-in the year 2023
-
-Registration Number: ABC2023001
-
-Date of Issue: December 2023''',
-                    'confidence': 0.92,
-                    'bounding_boxes': []
-                },
-                "prisha": {
-                    'success': True,
-                    'extracted_text': '''GRADUATION CERTIFICATE
-                    
-This certifies that
-
-PRISHA VERMA
-
-has completed
-
-M.Tech AI
-
-from
-
-Global Tech University
-
-Year: 2022
-
-Registration: ABC2022007''',
-                    'confidence': 0.88,
-                    'bounding_boxes': []
-                }
-            }
-            
-            # Select demo data based on filename
+            # Select demo data based on filename; copy so callers cannot mutate the samples
             filename_lower = uploaded_file.name.lower()
             if 'saksham' in filename_lower or 'abc2023001' in filename_lower:
-                ocr_result = demo_certificates["saksham"]
+                ocr_result = dict(DEMO_CERTIFICATES["saksham"])
             elif 'prisha' in filename_lower or 'abc2022007' in filename_lower:
-                ocr_result = demo_certificates["prisha"]
+                ocr_result = dict(DEMO_CERTIFICATES["prisha"])
             else:
                 # Default to Saksham's certificate
-                ocr_result = demo_certificates["saksham"]
+                ocr_result = dict(DEMO_CERTIFICATES["saksham"])
                 
             st.info("🎮 Demo Mode: Using sample OCR data for testing")
             
@@ -621,14 +673,23 @@ Registration: ABC2022007''',
             status_text.text("🔍 Running OCR analysis...")
             progress_bar.progress(20)
             
-            # Run OCR
+            # Run OCR (cached per upload, language and overlay setting)
             if OCRClient:
-                ocr_client = OCRClient()
-                ocr_result = ocr_client.extract_text_from_bytes(
-                    file_bytes,
-                    language=language,
-                    overlay=use_overlay
+                # OCR is a network round trip: run it on a worker thread and
+                # load the seal models on this thread while it is in flight
+                ocr_future = _submit_with_ctx(
+                    run_ocr,
+                    uploaded_file.file_id,
+                    language,
+                    use_overlay,
+                    file_bytes
                 )
+                if enable_seal_verification and not seal_demo_mode and SEAL_DETECTION_AVAILABLE:
+                    _warm_seal_models()
+                try:
+                    ocr_result = ocr_future.result()
+                except OCRFailed as e:
+                    ocr_result = e.result
             else:
                 # Fallback to demo mode if OCR not available
                 ocr_result = {'success': False, 'error': 'OCR components not available'}
@@ -648,7 +709,7 @@ Registration: ABC2022007''',
         
         # Run OCR verification
         if CertificateVerifier:
-            verifier = CertificateVerifier()
+            verifier = get_verifier()
             verification_result = verifier.verify_certificate(ocr_result, uploaded_file.name)
         else:
             # Demo mode verification result
@@ -660,21 +721,34 @@ Registration: ABC2022007''',
             }
         
         st.session_state.verification_result = verification_result
+        st.session_state.verdict = None
         
         # Step 2: Seal Verification with YOLOv8
         seal_result = None
-        if enable_seal_verification and temp_image_path:
+        ocr_failed = verification_result['decision'] != 'AUTHENTIC'
+        if enable_seal_verification and ocr_failed and not seal_demo_mode:
+            # A failed OCR check already rejects the certificate; the seal result cannot change that
+            seal_result = {
+                "step": "Seal Verification",
+                "status": "Skipped",
+                "reason": "OCR verification failed; seal check skipped",
+                "seal_status": "Skipped",
+                "confidence": 0.0
+            }
+            st.session_state.cropped_seals = []
+        elif enable_seal_verification and uploaded_file.type.startswith('image'):
             status_text.text("🔎 Detecting and verifying seals with AI...")
             progress_bar.progress(70)
             
+            temp_image_path = None
             try:
                 # Initialize seal detector
-                seal_detector = SealDetector()
+                seal_detector = get_seal_detector()
                 
                 if seal_demo_mode:
                     # Use demo seal verification
                     if VIT_AVAILABLE:
-                        classifier = ViTSealClassifier()
+                        classifier = get_vit_classifier()
                         seal_result = classifier.create_dummy_prediction(confidence=0.82)
                     else:
                         seal_result = {
@@ -691,6 +765,13 @@ Registration: ABC2022007''',
                     
                 else:
                     # Real YOLOv8 seal detection and verification
+                    # Detectors read from a path; write the upload's buffer straight to disk,
+                    # and only once OCR has passed and a real detection is needed
+                    suffix = f".{uploaded_file.name.split('.')[-1]}"
+                    with tempfile.NamedTemporaryFile(prefix="temp_cert_", suffix=suffix, delete=False) as f:
+                        f.write(file_bytes)
+                        temp_image_path = f.name
+                    
                     st.write("**🤖 YOLOv8 Seal Detection in Progress...**")
                     
                     # Get detection summary with Streamlit integration
@@ -727,15 +808,14 @@ Registration: ABC2022007''',
                         cropped_seals = seal_detector.crop_seals_from_image(temp_image_path)
                         st.session_state.cropped_seals = []
                         
-                        # Convert cropped seals to expected format
+                        # Keep small PNG thumbnails in session state rather than full PIL crops
                         for i, cropped_path in enumerate(cropped_seals):
                             if os.path.exists(cropped_path):
-                                from PIL import Image
-                                seal_img = Image.open(cropped_path)
                                 detection = summary['detections'][i] if i < len(summary['detections']) else {}
+                                crop_stat = os.stat(cropped_path)
                                 
                                 st.session_state.cropped_seals.append({
-                                    'pil_image': seal_img,
+                                    'thumb': _seal_thumb(cropped_path, crop_stat.st_mtime_ns, crop_stat.st_size),
                                     'path': cropped_path,
                                     'method': f"YOLOv8 ({detection.get('class', 'unknown')})",
                                     'confidence': detection.get('confidence', 0.0),
@@ -790,61 +870,30 @@ Registration: ABC2022007''',
                     "seal_status": "Error",
                     "confidence": 0.0
                 }
-            
-            # Clean up temp file
-            try:
-                if os.path.exists(temp_image_path):
-                    os.remove(temp_image_path)
-                    os.rmdir(os.path.dirname(temp_image_path))
-            except:
-                pass
+            finally:
+                # Clean up temp file
+                if temp_image_path:
+                    try:
+                        os.remove(temp_image_path)
+                    except OSError:
+                        pass
         
         st.session_state.seal_result = seal_result
+        st.session_state.verdict = compute_verdict(verification_result, seal_result)
+        st.session_state.report_json = None
         
-        status_text.text("✅ Verification complete!")
-        progress_bar.progress(100)
-        
-        # Clear progress indicators
-        time.sleep(1)
+        # Clear progress indicators; the toast shows completion without blocking
         progress_bar.empty()
         status_text.empty()
+        st.toast("Verification complete!", icon="✅")
         
         # Show success message with improved decision logic
-        ocr_status = "Pass" if verification_result['decision'] == 'AUTHENTIC' else "Fail"
-        seal_status = seal_result.get('status', 'Unknown') if seal_result else 'Not Checked'
-        
-        # Apply same security-first decision logic
-        ocr_confidence = verification_result.get('final_score', 0)
-        seal_confidence = seal_result.get('confidence', 0) if seal_result else 0
-        
-        # Security-first decision criteria:
-        both_pass = (ocr_status == "Pass" and seal_status == "Pass")
-        
-        # CRITICAL SECURITY CHECK: If fake seals detected with high confidence, REJECT
-        fake_seals_detected = False
-        rejection_reason = None
-        if seal_result and seal_result.get('details'):
-            fake_count = seal_result['details'].get('fake_seals', 0)
-            total_seals = seal_result['details'].get('total_seals', 0)
-            if fake_count > 0 and seal_confidence > 0.7:  # High confidence fake detection
-                fake_seals_detected = True
-                rejection_reason = f"High confidence fake seal detection ({seal_confidence:.1%})"
-        
-        # REJECT if fake seals detected with high confidence
-        if fake_seals_detected:
-            final_decision = "Fake"
-        else:
-            # Only pass if both OCR and seals pass, or if no seal verification was performed
-            if seal_result is None:  # No seal verification
-                final_decision = "Real" if (ocr_status == "Pass" and ocr_confidence > 0.8) else "Fake"
-            else:  # Seal verification was performed
-                final_decision = "Real" if both_pass else "Fake"
-        
-        if final_decision == "Real":
+        verdict = st.session_state.verdict
+        if verdict['final_decision'] == "Real":
             st.success("🎉 Certificate verification completed - AUTHENTIC!")
         else:
-            if rejection_reason:
-                st.error(f"❌ Certificate verification failed - {rejection_reason}")
+            if verdict['rejection_reason']:
+                st.error(f"❌ Certificate verification failed - {verdict['rejection_reason']}")
             else:
                 st.error("❌ Certificate verification failed - verification issues detected.")
         
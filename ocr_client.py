@@ -25,6 +25,9 @@ class OCRClient:
         self.base_url = "https://api.ocr.space/parse/image"
         self.timeout = 30
         
+        # Keep-alive session so repeated uploads reuse the TLS connection
+        self.session = requests.Session()
+        
     def extract_text_from_file(self, file_path: str, **kwargs) -> Dict[str, Any]:
         """
         Extract text from an image file using OCR.space API.
@@ -54,12 +57,12 @@ class OCRClient:
                 'bounding_boxes': []
             }
     
-    def extract_text_from_bytes(self, image_bytes: bytes, **kwargs) -> Dict[str, Any]:
+    def extract_text_from_bytes(self, image_bytes: Union[bytes, memoryview], **kwargs) -> Dict[str, Any]:
         """
         Extract text from image bytes using OCR.space API.
         
         Args:
-            image_bytes: Raw image bytes
+            image_bytes: Raw image bytes, or a memoryview over them (passed through without copying)
             **kwargs: Additional OCR parameters (language, overlay, etc.)
             
         Returns:
@@ -86,7 +89,7 @@ class OCRClient:
         try:
             print("Calling OCR.space API...")
             print(f"Image size: {len(image_bytes)} bytes")
-            response = requests.post(
+            response = self.session.post(
                 self.base_url,
                 data=payload,
                 files=files,
@@ -6,6 +6,85 @@ import cv2
 import numpy as np
 from PIL import Image
 import os
+import copy
+import contextlib
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# HOUGH_GRADIENT_ALT (OpenCV >= 4.3) is more accurate and yields far fewer false circles
+_HOUGH_METHOD = getattr(cv2, 'HOUGH_GRADIENT_ALT', cv2.HOUGH_GRADIENT)
+
+def _decode_image(image_path):
+    """Decode an image into BGR and grayscale arrays; (None, None) if unreadable."""
+    image = cv2.imread(image_path)
+    if image is None:
+        return None, None
+    return image, cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+# Decodes shared by the detection passes of an active _decode_scope, keyed on path.
+# Entries only live as long as their scope, so deleted temp uploads are not kept alive.
+_DECODE_SCOPES = {}
+_DECODE_SCOPES_LOCK = threading.Lock()
+
+@contextlib.contextmanager
+def _decode_scope(image_path):
+    """Share one decode of image_path between every _read_image call inside the block."""
+    with _DECODE_SCOPES_LOCK:
+        entry = _DECODE_SCOPES.get(image_path)
+        if entry is None:
+            entry = _DECODE_SCOPES[image_path] = {'users': 0, 'arrays': None, 'lock': threading.Lock()}
+        entry['users'] += 1
+    try:
+        yield
+    finally:
+        with _DECODE_SCOPES_LOCK:
+            entry['users'] -= 1
+            if entry['users'] == 0:
+                del _DECODE_SCOPES[image_path]
+
+def _downscale(gray):
+    """Shrink large scans by an integer factor for the coarse detection passes; returns (small, scale)."""
+    scale = max(1, min(gray.shape) // 1000)
+    if scale == 1:
+        return gray, 1
+    return cv2.resize(gray, None, fx=1 / scale, fy=1 / scale, interpolation=cv2.INTER_AREA), scale
+
+def _read_image(image_path):
+    """Return (BGR, gray) arrays for an image path, shared within a _decode_scope."""
+    with _DECODE_SCOPES_LOCK:
+        entry = _DECODE_SCOPES.get(image_path)
+    if entry is None:
+        return _decode_image(image_path)
+    
+    with entry['lock']:
+        if entry['arrays'] is None:
+            arrays = _decode_image(image_path)
+            # Shared between passes: make accidental in-place edits fail loudly
+            for arr in arrays:
+                if arr is not None:
+                    arr.flags.writeable = False
+            entry['arrays'] = arrays
+        return entry['arrays']
+
+def _file_digest(path):
+    """Content fingerprint of a file, so re-uploads of the same scan hit the detection cache."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+class _CroppedSeal(dict):
+    """Cropped seal record whose 'pil_image' entry is converted from BGR on first access."""
+    
+    def __init__(self, info, bgr):
+        super().__init__(info)
+        self._bgr = bgr
+    
+    def __missing__(self, key):
+        if key != 'pil_image':
+            raise KeyError(key)
+        self[key] = Image.fromarray(cv2.cvtColor(self._bgr, cv2.COLOR_BGR2RGB))
+        return self[key]
 
 class SealDetector:
     def __init__(self):
@@ -15,38 +94,59 @@ class SealDetector:
         self.min_radius = 40        # Minimum radius for actual seals
         self.max_radius = 120       # Maximum radius for seals
         self.min_circularity = 0.7  # Must be reasonably circular
+        
+        # Route the full-image filters through OpenCL (T-API) when a device is available
+        self.use_umat = cv2.ocl.haveOpenCL()
+        
+        # Decoded grayscale templates, keyed on template path
+        self._template_cache = {}
+        
+        # Recent detect_all_seals results, keyed on (image content digest, template path)
+        self._detection_cache = OrderedDict()
+        self._detection_cache_size = 128
+        self._detection_cache_lock = threading.Lock()
     
     def detect_circular_seals(self, image_path):
         """Detect ONLY actual circular seals, ignore text regions."""
         try:
-            # Read image
-            image = cv2.imread(image_path)
+            # Read image (decoded once and shared by every detection pass)
+            image, gray = _read_image(image_path)
             if image is None:
                 return []
             
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            # Seals are large, low-frequency shapes: search a reduced copy of big scans
+            small, scale = _downscale(gray)
             
-            # Strong preprocessing to enhance circular structures only
-            blurred = cv2.GaussianBlur(gray, (15, 15), 3)
-            
-            # Apply edge detection to find strong circular edges
-            edges = cv2.Canny(blurred, 50, 150)
+            # Light smoothing only; the Hough transform computes its own gradients
+            blurred = cv2.GaussianBlur(cv2.UMat(small) if self.use_umat else small, (7, 7), 1.5)
             
             # Detect circles with STRICT parameters for actual seals only
+            if _HOUGH_METHOD == cv2.HOUGH_GRADIENT:
+                # Older OpenCV: param2 is an accumulator vote threshold
+                hough_params = dict(dp=1, param1=100, param2=35)
+            else:
+                # HOUGH_GRADIENT_ALT: param2 is the required circle "perfectness" (0-1)
+                hough_params = dict(dp=1.5, param1=300, param2=0.9)
             circles = cv2.HoughCircles(
-                edges,
-                cv2.HOUGH_GRADIENT,
-                dp=1,
-                minDist=100,        # Large distance to avoid multiple detections
-                param1=100,         # High edge threshold
-                param2=35,          # Strong circle evidence required
-                minRadius=self.min_radius,   # Only actual seal sizes
-                maxRadius=self.max_radius
+                blurred,
+                _HOUGH_METHOD,
+                minDist=100 // scale,        # Large distance to avoid multiple detections
+                minRadius=self.min_radius // scale,   # Only actual seal sizes
+                maxRadius=self.max_radius // scale,
+                **hough_params
             )
             
+            if isinstance(circles, cv2.UMat):
+                circles = circles.get()  # None when no circles were found
+            
             detected_seals = []
             if circles is not None:
-                circles = np.round(circles[0, :]).astype("int")
+                # Back to full-resolution coordinates for validation and cropping
+                circles = np.round(circles[0, :, :3] * scale).astype("int")
+                
+                # Gradients for the radial-edge check, computed once per image
+                gx = cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3)
+                gy = cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3)
                 
                 for (x, y, r) in circles:
                     # Ensure the circle is within image bounds
@@ -59,53 +159,23 @@ class SealDetector:
                     # STRICT filtering - only accept if it's actually seal-sized
                     if self.min_seal_area <= area <= self.max_seal_area:
                         
-                        # Additional validation: check if region looks like a seal
-                        roi = gray[y1:y2, x1:x2]
-                        if roi.size > 0:
-                            # Check for circular patterns in the ROI
-                            roi_edges = cv2.Canny(roi, 30, 100)
-                            roi_circles = cv2.HoughCircles(
-                                roi_edges,
-                                cv2.HOUGH_GRADIENT,
-                                dp=1,
-                                minDist=20,
-                                param1=50,
-                                param2=20,
-                                minRadius=r//3,  # Inner circle of seal
-                                maxRadius=r-5    # Outer boundary
-                            )
-                            
-                            # Only accept if we find circular structure within the region
-                            if roi_circles is not None:
-                                confidence = min(0.95, 0.7 + (len(roi_circles[0]) * 0.1))
-                                
-                                detected_seals.append({
-                                    'bbox': (x1, y1, x2, y2),
-                                    'center': (x, y),
-                                    'radius': r,
-                                    'area': area,
-                                    'confidence': confidence,
-                                    'method': 'circular_validated'
-                                })
-                    area = np.pi * r * r
-                    if self.min_seal_area <= area <= self.max_seal_area:
-                        # Calculate confidence based on circle quality and size
-                        # Factors: circle strength, size appropriateness, and position
-                        size_score = min(1.0, area / self.max_seal_area)  # Larger seals get higher score
-                        position_score = 1.0  # Could add edge/corner penalty later
-                        circle_strength = min(1.0, len(circles[0]) / max(1, len(circles[0]) * 0.1))  # Relative strength
-                        
-                        # Combine factors with some randomness for realism
-                        base_confidence = (size_score * 0.4 + position_score * 0.3 + circle_strength * 0.3)
-                        confidence = max(0.65, min(0.98, base_confidence + np.random.uniform(-0.05, 0.05)))
+                        # Additional validation: the circle's rim must carry real radial edges
+                        edge_score = self._radial_edge_score(gx, gy, x, y, r)
                         
-                        detected_seals.append({
-                            'bbox': (x1, y1, x2, y2),
-                            'center': (x, y),
-                            'radius': r,
-                            'area': area,
-                            'confidence': confidence  # Dynamic confidence calculation
-                        })
+                        # ...and, like the nested-circle check it replaced, hold a concentric inner ring
+                        inner_score = self._inner_ring_score(gx, gy, x, y, r) if edge_score > 0.4 else 0.0
+                        if inner_score > 0.5:
+                            # Both rings count: a bare outline can never reach the cap
+                            confidence = min(0.95, 0.55 + edge_score * 0.2 + inner_score * 0.2)
+                            
+                            detected_seals.append({
+                                'bbox': (x1, y1, x2, y2),
+                                'center': (x, y),
+                                'radius': r,
+                                'area': area,
+                                'confidence': confidence,
+                                'method': 'circular_validated'
+                            })
             
             return detected_seals
             
@@ -116,69 +186,86 @@ class SealDetector:
     def detect_official_seals(self, image_path):
         """Detect official seals by looking for 'OFFICIAL SEAL' text pattern."""
         try:
-            image = cv2.imread(image_path)
+            image, gray = _read_image(image_path)
             if image is None:
                 return []
             
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
             # Look for areas with "OFFICIAL" or "SEAL" text
             # Use template matching or OCR-like approach
             
-            # Apply threshold to find dark text regions
-            _, thresh = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY_INV)
+            # Apply threshold to find dark text regions (on a reduced copy of big scans)
+            small, scale = _downscale(gray)
+            _, thresh = cv2.threshold(cv2.UMat(small) if self.use_umat else small, 127, 255, cv2.THRESH_BINARY_INV)
+            if isinstance(thresh, cv2.UMat):
+                thresh = thresh.get()
             
             # Find contours
             contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            if scale > 1:
+                # Back to full-resolution coordinates; the ROI checks below use the full image
+                contours = [contour * scale for contour in contours]
             
             detected_seals = []
-            for contour in contours:
-                area = cv2.contourArea(contour)
+            if not contours:
+                return detected_seals
+            
+            # Cheap shape pre-filter over all contours at once, so only a handful
+            # of candidates reach the Hough check below
+            areas = np.fromiter((cv2.contourArea(c) for c in contours), dtype=float, count=len(contours))
+            rects = np.array([cv2.boundingRect(c) for c in contours])
+            w, h = rects[:, 2], rects[:, 3]
+            aspect_ratios = w / np.maximum(h, 1)
+            
+            # Medium to large areas (typical of official seals) that are roughly circular/square
+            keep = (areas >= 4000) & (areas <= 40000) & (aspect_ratios >= 0.8) & (aspect_ratios <= 1.2)
+            
+            for i in np.nonzero(keep)[0]:
+                contour, area = contours[i], areas[i]
+                x, y, w, h = rects[i].tolist()
+                
+                # Calculate circularity
+                perimeter = cv2.arcLength(contour, True)
+                if perimeter <= 0:
+                    continue
+                circularity = 4 * np.pi * area / (perimeter * perimeter)
+                if circularity <= self.min_circularity:
+                    continue
                 
-                # Look for medium to large circular areas (typical of official seals)
-                if 4000 <= area <= 40000:
-                    x, y, w, h = cv2.boundingRect(contour)
-                    aspect_ratio = w / h if h > 0 else 0
+                # Check if region might contain circular seal
+                roi = gray[y:y+h, x:x+w]
+                
+                # Look for circular edges in the region: the strongest 5% of the Scharr
+                # gradient magnitude is enough of an edge map for HoughCircles
+                # (>= so scans whose edges all saturate at 255 still keep them)
+                roi_gx = cv2.convertScaleAbs(cv2.Scharr(roi, cv2.CV_16S, 1, 0))
+                roi_gy = cv2.convertScaleAbs(cv2.Scharr(roi, cv2.CV_16S, 0, 1))
+                magnitude = cv2.addWeighted(roi_gx, 0.5, roi_gy, 0.5, 0)
+                edge_level = max(1, np.percentile(magnitude, 95))
+                roi_edges = (magnitude >= edge_level).astype(np.uint8) * 255
+                
+                # Check for circular patterns
+                circles = cv2.HoughCircles(
+                    roi_edges,
+                    cv2.HOUGH_GRADIENT,
+                    dp=1,
+                    minDist=min(w, h)//3,
+                    param1=50,
+                    param2=25,
+                    minRadius=min(w, h)//4,
+                    maxRadius=min(w, h)//2
+                )
+                
+                if circles is not None and len(circles[0]) > 0:
+                    confidence = min(0.98, 0.8 + circularity * 0.2)
                     
-                    # Must be roughly circular/square
-                    if 0.8 <= aspect_ratio <= 1.2:
-                        
-                        # Check if region might contain circular seal
-                        roi = gray[y:y+h, x:x+w]
-                        
-                        # Look for circular edges in the region
-                        roi_blur = cv2.GaussianBlur(roi, (7, 7), 1)
-                        roi_edges = cv2.Canny(roi_blur, 30, 100)
-                        
-                        # Check for circular patterns
-                        circles = cv2.HoughCircles(
-                            roi_edges,
-                            cv2.HOUGH_GRADIENT,
-                            dp=1,
-                            minDist=min(w, h)//3,
-                            param1=50,
-                            param2=25,
-                            minRadius=min(w, h)//4,
-                            maxRadius=min(w, h)//2
-                        )
-                        
-                        if circles is not None and len(circles[0]) > 0:
-                            # Calculate circularity
-                            perimeter = cv2.arcLength(contour, True)
-                            if perimeter > 0:
-                                circularity = 4 * np.pi * area / (perimeter * perimeter)
-                                
-                                if circularity > self.min_circularity:
-                                    confidence = min(0.98, 0.8 + circularity * 0.2)
-                                    
-                                    detected_seals.append({
-                                        'bbox': (x, y, x + w, y + h),
-                                        'center': (x + w//2, y + h//2),
-                                        'area': area,
-                                        'confidence': confidence,
-                                        'method': 'official_seal',
-                                        'circularity': circularity
-                                    })
+                    detected_seals.append({
+                        'bbox': (x, y, x + w, y + h),
+                        'center': (x + w//2, y + h//2),
+                        'area': area,
+                        'confidence': confidence,
+                        'method': 'official_seal',
+                        'circularity': circularity
+                    })
             
             return detected_seals
             
@@ -199,8 +286,12 @@ class SealDetector:
         
         try:
             # Read images
-            image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-            template = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+            _, image = _read_image(image_path)
+            template = self._template_cache.get(template_path)
+            if template is None:
+                template = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+                if template is not None:
+                    self._template_cache[template_path] = template
             
             if image is None or template is None:
                 return []
@@ -208,20 +299,31 @@ class SealDetector:
             # Perform template matching
             result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
             
-            # Find locations where matching is above threshold
+            # Keep only local maxima of the score map that clear the threshold,
+            # instead of every pixel around each match
             threshold = 0.6
-            locations = np.where(result >= threshold)
-            
-            detected_seals = []
             h, w = template.shape
+            neighbourhood = np.ones((max(1, h // 2), max(1, w // 2)), np.uint8)
+            local_max = cv2.dilate(result, neighbourhood)
+            ys, xs = np.nonzero((result == local_max) & (result >= threshold))
+            scores = result[ys, xs]
+            
+            # Best peaks first, capped so a repetitive page cannot flood the candidates
+            max_matches = 20
+            if len(scores) > max_matches:
+                top = np.argpartition(scores, -max_matches)[-max_matches:]
+                xs, ys, scores = xs[top], ys[top], scores[top]
+            order = np.argsort(-scores, kind='stable')
+            bboxes = np.stack([xs, ys, xs + w, ys + h], axis=1)[order]
             
-            for pt in zip(*locations[::-1]):  # Switch x and y coordinates
-                x, y = pt
-                detected_seals.append({
-                    'bbox': (x, y, x + w, y + h),
-                    'center': (x + w//2, y + h//2),
-                    'confidence': result[y, x]
-                })
+            detected_seals = [
+                {
+                    'bbox': (x1, y1, x2, y2),
+                    'center': (x1 + w//2, y1 + h//2),
+                    'confidence': score
+                }
+                for (x1, y1, x2, y2), score in zip(bboxes.tolist(), scores[order].tolist())
+            ]
             
             return detected_seals
             
@@ -229,23 +331,27 @@ class SealDetector:
             print(f"Error in template seal detection: {e}")
             return []
     
+    def _slice_bbox(self, image, bbox, padding=10):
+        """Return the padded bbox region of a BGR image as a view (no copy)."""
+        x1, y1, x2, y2 = bbox
+        
+        # Add padding
+        x1 = max(0, x1 - padding)
+        y1 = max(0, y1 - padding)
+        x2 = min(image.shape[1], x2 + padding)
+        y2 = min(image.shape[0], y2 + padding)
+        
+        return image[y1:y2, x1:x2]
+    
     def crop_seal_region(self, image_path, bbox, padding=10):
         """Crop seal region from image."""
         try:
-            image = cv2.imread(image_path)
+            image, _ = _read_image(image_path)
             if image is None:
                 return None
             
-            x1, y1, x2, y2 = bbox
-            
-            # Add padding
-            x1 = max(0, x1 - padding)
-            y1 = max(0, y1 - padding)
-            x2 = min(image.shape[1], x2 + padding)
-            y2 = min(image.shape[0], y2 + padding)
-            
             # Crop image
-            cropped = image[y1:y2, x1:x2]
+            cropped = self._slice_bbox(image, bbox, padding)
             
             # Convert to PIL Image
             cropped_pil = Image.fromarray(cv2.cvtColor(cropped, cv2.COLOR_BGR2RGB))
@@ -258,22 +364,55 @@ class SealDetector:
     
     def detect_all_seals(self, image_path, template_path=None):
         """Detect ONLY actual seals, prioritize official seals, reject text regions."""
-        all_seals = []
+        try:
+            key = (_file_digest(image_path), template_path)
+        except OSError:
+            return self._detect_all_seals(image_path, template_path)
         
-        # Method 1: Official seal detection (HIGHEST PRIORITY)
-        official_seals = self.detect_official_seals(image_path)
-        all_seals.extend(official_seals)
+        with self._detection_cache_lock:
+            seals = self._detection_cache.get(key)
+            if seals is not None:
+                self._detection_cache.move_to_end(key)
         
-        # Method 2: Strict circular detection (MEDIUM PRIORITY)
-        circular_seals = self.detect_circular_seals(image_path)
-        all_seals.extend(circular_seals)
+        if seals is None:
+            seals = self._detect_all_seals(image_path, template_path)
+            with self._detection_cache_lock:
+                self._detection_cache[key] = seals
+                if len(self._detection_cache) > self._detection_cache_size:
+                    self._detection_cache.popitem(last=False)
         
-        # Method 3: Template matching (if template provided)
-        if template_path:
-            template_seals = self.detect_template_seals(image_path, template_path)
-            for seal in template_seals:
-                seal['method'] = 'template'
-            all_seals.extend(template_seals)
+        # Callers may annotate the returned dicts, so never hand out the cached ones
+        return copy.deepcopy(seals)
+    
+    def _detect_all_seals(self, image_path, template_path=None):
+        """Uncached body of detect_all_seals."""
+        all_seals = []
+        
+        # Decode once, up front, and share the arrays with every worker thread
+        with _decode_scope(image_path):
+            _read_image(image_path)
+            
+            # The passes are independent and spend their time in OpenCV calls that
+            # release the GIL, so run them side by side
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                # Method 1: Official seal detection (HIGHEST PRIORITY)
+                official_future = executor.submit(self.detect_official_seals, image_path)
+                
+                # Method 2: Strict circular detection (MEDIUM PRIORITY)
+                circular_future = executor.submit(self.detect_circular_seals, image_path)
+                
+                # Method 3: Template matching (if template provided)
+                template_future = None
+                if template_path:
+                    template_future = executor.submit(self.detect_template_seals, image_path, template_path)
+                
+                all_seals.extend(official_future.result())
+                all_seals.extend(circular_future.result())
+                if template_future is not None:
+                    template_seals = template_future.result()
+                    for seal in template_seals:
+                        seal['method'] = 'template'
+                    all_seals.extend(template_seals)
         
         # SKIP contour detection as it picks up text regions
         
@@ -292,77 +431,115 @@ class SealDetector:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
-        # Detect seals
-        detected_seals = self.detect_all_seals(image_path, template_path)
-        
-        cropped_seals = []
+        # One decode serves both detection and cropping
+        with _decode_scope(image_path):
+            # Detect seals
+            detected_seals = self.detect_all_seals(image_path, template_path)
+            
+            cropped_seals = []
+            
+            image, _ = _read_image(image_path)
+            if image is None:
+                return cropped_seals
         
-        for i, seal in enumerate(detected_seals):
-            # Crop seal region
-            cropped_image = self.crop_seal_region(image_path, seal['bbox'])
-            
-            if cropped_image:
-                # Save cropped seal
-                base_name = os.path.splitext(os.path.basename(image_path))[0]
-                output_path = os.path.join(output_dir, f"{base_name}_seal_{i+1}.png")
-                cropped_image.save(output_path)
+            for i, seal in enumerate(detected_seals):
+                # Crop seal region (a BGR view of the shared decode, written straight to disk)
+                cropped = self._slice_bbox(image, seal['bbox'])
+            
+                if cropped.size:
+                    # Save cropped seal
+                    base_name = os.path.splitext(os.path.basename(image_path))[0]
+                    output_path = os.path.join(output_dir, f"{base_name}_seal_{i+1}.png")
+                    cv2.imwrite(output_path, cropped)
                 
-                cropped_seals.append({
-                    'image_path': output_path,
-                    'bbox': seal['bbox'],
-                    'confidence': seal['confidence'],
-                    'method': seal['method'],
-                    'pil_image': cropped_image
-                })
+                    # Keep a copy so the result does not pin the whole decoded page;
+                    # 'pil_image' is only built if a caller asks for it
+                    cropped_seals.append(_CroppedSeal({
+                        'image_path': output_path,
+                        'bbox': seal['bbox'],
+                        'confidence': seal['confidence'],
+                        'method': seal['method']
+                    }, bgr=cropped.copy()))
         
         return cropped_seals
     
-    def _remove_duplicate_seals(self, seals, overlap_threshold=0.5):
-        """Remove duplicate seals based on overlap."""
-        if not seals:
-            return []
+    def _radial_edge_score(self, gx, gy, x, y, r, n_angles=64, band=3):
+        """Fraction of rim directions where the gradient is strong and points along the radius."""
+        theta = np.linspace(0, 2 * np.pi, n_angles, endpoint=False)
+        cos_t, sin_t = np.cos(theta), np.sin(theta)
         
-        # Sort by confidence
-        seals.sort(key=lambda x: x['confidence'], reverse=True)
+        # Sample a thin band around the detected radius, since Hough radii are approximate
+        radii = r + np.arange(-band, band + 1)[:, None]
+        xs = np.clip(np.rint(x + radii * cos_t), 0, gx.shape[1] - 1).astype(np.intp)
+        ys = np.clip(np.rint(y + radii * sin_t), 0, gx.shape[0] - 1).astype(np.intp)
         
-        filtered = [seals[0]]  # Keep the highest confidence seal
+        sx = gx[ys, xs].astype(np.float32)
+        sy = gy[ys, xs].astype(np.float32)
+        magnitude = np.hypot(sx, sy)
+        radial = np.abs(sx * cos_t + sy * sin_t)
         
-        for seal in seals[1:]:
-            is_duplicate = False
-            
-            for existing in filtered:
-                overlap = self._calculate_overlap(seal['bbox'], existing['bbox'])
-                if overlap > overlap_threshold:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                filtered.append(seal)
+        # An angle counts if any sample in the band has a strong, radially aligned edge
+        aligned = (magnitude > 100) & (radial > 0.9 * magnitude)
+        return float(aligned.any(axis=0).mean())
+    
+    def _inner_ring_score(self, gx, gy, x, y, r):
+        """Best rim score of any circle concentric with (x, y, r) inside 0.5r-0.8r.
         
-        return filtered
+        Seals are stamped with a second, inner ring; a plain decorative circle
+        (e.g. a logo outline) has nothing but text inside it. The 0.8r upper
+        limit keeps the outer ring's own thickness out of the search.
+        """
+        inner_radii = range(int(0.5 * r), int(0.8 * r) + 1)
+        return max((self._radial_edge_score(gx, gy, x, y, ri, band=1) for ri in inner_radii), default=0.0)
     
-    def _calculate_overlap(self, bbox1, bbox2):
-        """Calculate overlap ratio between two bounding boxes."""
-        x1_1, y1_1, x2_1, y2_1 = bbox1
-        x1_2, y1_2, x2_2, y2_2 = bbox2
+    def _remove_duplicate_seals(self, seals, overlap_threshold=0.5):
+        """Remove duplicate seals based on overlap (greedy non-maximum suppression)."""
+        if not seals:
+            return []
         
-        # Calculate intersection
-        x1_i = max(x1_1, x1_2)
-        y1_i = max(y1_1, y1_2)
-        x2_i = min(x2_1, x2_2)
-        y2_i = min(y2_1, y2_2)
+        boxes = np.asarray([seal['bbox'] for seal in seals], dtype=np.float32)
+        confidences = np.asarray([seal['confidence'] for seal in seals])
+        areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
         
-        if x2_i <= x1_i or y2_i <= y1_i:
-            return 0.0  # No intersection
+        # Highest confidence first; stable so ties keep their detection order
+        order = np.argsort(-confidences, kind='stable')
         
-        intersection_area = (x2_i - x1_i) * (y2_i - y1_i)
+        # Scratch buffers reused by every suppression step instead of fresh temporaries
+        n = len(seals)
+        xx1, yy1 = np.empty(n, np.float32), np.empty(n, np.float32)
+        xx2, yy2 = np.empty(n, np.float32), np.empty(n, np.float32)
+        iou = np.empty(n, np.float32)
         
-        # Calculate union
-        area1 = (x2_1 - x1_1) * (y2_1 - y1_1)
-        area2 = (x2_2 - x1_2) * (y2_2 - y1_2)
-        union_area = area1 + area2 - intersection_area
+        keep = []
+        while order.size > 0:
+            i, rest = order[0], order[1:]
+            keep.append(i)
+            m = rest.size
+            
+            # IoU of the kept box against every remaining box in one pass
+            x1, y1, x2, y2 = xx1[:m], yy1[:m], xx2[:m], yy2[:m]
+            np.maximum(boxes[i, 0], boxes[rest, 0], out=x1)
+            np.maximum(boxes[i, 1], boxes[rest, 1], out=y1)
+            np.minimum(boxes[i, 2], boxes[rest, 2], out=x2)
+            np.minimum(boxes[i, 3], boxes[rest, 3], out=y2)
+            
+            # Intersection width/height (clamped at 0), then area, in place
+            np.subtract(x2, x1, out=x2)
+            np.maximum(x2, 0, out=x2)
+            np.subtract(y2, y1, out=y2)
+            np.maximum(y2, 0, out=y2)
+            intersection = np.multiply(x2, y2, out=x1)
+            
+            # Union = area_i + area_rest - intersection; IoU is 0 where the union is empty
+            union = np.add(areas[rest], areas[i], out=y1)
+            np.subtract(union, intersection, out=union)
+            overlap = iou[:m]
+            overlap.fill(0)
+            np.divide(intersection, union, out=overlap, where=union > 0)
+            
+            order = rest[overlap <= overlap_threshold]
         
-        return intersection_area / union_area if union_area > 0 else 0.0
+        return [seals[i] for i in keep]
 
 # Test function
 def test_seal_detection(image_path):
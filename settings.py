@@ -0,0 +1,20 @@
+"""
+App settings, read once per process.
+
+Streamlit re-executes main.py on every interaction, but imported modules are
+cached in sys.modules, so values defined here are only computed on first import.
+"""
+
+import os
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+# SQLite certificate database
+DB_PATH = "certs.db"
+
+# OCR.space API key (None when not configured)
+API_KEY = os.getenv('OCRSPACE_API_KEY')
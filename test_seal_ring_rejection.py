@@ -0,0 +1,68 @@
+"""
+Regression check: the plain logo ring on generated certificates must not be
+reported as a seal, while the double-rimmed institutional seal still is.
+"""
+
+import os
+import tempfile
+from PIL import Image, ImageDraw
+
+from seal_detector import SealDetector
+from generate_complete_certificates import _build_base, create_complete_certificate
+
+# Logo ring drawn by _build_base
+LOGO_CENTER = (600, 220)
+
+def _near_logo(seal, tolerance=15):
+    """True if a detection is centred on the logo ring."""
+    x, y = seal['center']
+    return abs(x - LOGO_CENTER[0]) <= tolerance and abs(y - LOGO_CENTER[1]) <= tolerance
+
+def test_logo_ring_rejected():
+    """The certificate background alone (logo ring + text) has no seal."""
+    detector = SealDetector()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "background.png")
+        _build_base("DevLabs Institute").save(path)
+        seals = detector.detect_circular_seals(path)
+    
+    print(f"Background only: {len(seals)} circular seal(s)")
+    assert not seals, f"Logo ring detected as a seal: {seals}"
+
+def test_plain_ring_rejected():
+    """A bare drawn circle scores well on its rim but has no inner ring."""
+    detector = SealDetector()
+    
+    img = Image.new('RGB', (400, 400), 'white')
+    draw = ImageDraw.Draw(img)
+    draw.ellipse([140, 140, 260, 260], outline='#1f4e79', width=3)
+    draw.text((200, 200), "LOGO", fill='#1f4e79', anchor="mm")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ring.png")
+        img.save(path)
+        seals = detector.detect_circular_seals(path)
+    
+    print(f"Plain ring: {len(seals)} circular seal(s)")
+    assert not seals, f"Plain ring detected as a seal: {seals}"
+
+def test_certificate_seal_still_found():
+    """On a full generated certificate only the real seal is reported."""
+    detector = SealDetector()
+    cert_data = ("ABC2023001", "Saksham Sharma", "DevLabs Institute", "B.Tech Computer Engineering", "2023", "")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path, is_authentic = create_complete_certificate(cert_data, "authentic", output_dir=tmp)
+        seals = detector.detect_all_seals(path)
+    
+    print(f"Full certificate: {[(s['method'], round(s['confidence'], 3)) for s in seals]}")
+    assert not any(_near_logo(s) for s in seals), f"Logo ring detected as a seal: {seals}"
+    if is_authentic:
+        assert len(seals) == 1, f"Expected exactly the institutional seal, got {seals}"
+
+if __name__ == "__main__":
+    test_logo_ring_rejected()
+    test_plain_ring_rejected()
+    test_certificate_seal_still_found()
+    print("✅ Logo/plain rings are rejected and the real seal is still detected")
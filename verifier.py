@@ -7,14 +7,16 @@ import os
 class CertificateVerifier:
     """Certificate verification engine using OCR results and database lookup."""
     
-    def __init__(self, db_path: str = "certs.db"):
+    def __init__(self, db_path: str = "certs.db", conn: Optional[sqlite3.Connection] = None):
         """
         Initialize the verifier.
         
         Args:
             db_path: Path to SQLite database containing certificate records
+            conn: Optional open connection to reuse for lookups instead of connecting per lookup
         """
         self.db_path = db_path
+        self.conn = conn
         
         # Configurable regex patterns for registration number extraction
         self.reg_patterns = [
@@ -171,7 +173,7 @@ class CertificateVerifier:
             return None
         
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.conn or sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
             # Try exact match first in both reg_no and usn columns
@@ -210,7 +212,8 @@ class CertificateVerifier:
                     """, (best_match, best_match))
                     result = cursor.fetchone()
             
-            conn.close()
+            if conn is not self.conn:
+                conn.close()
             
             if result:
                 return {
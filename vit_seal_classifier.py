@@ -3,7 +3,6 @@ ViT Seal Classifier - Evaluation and prediction module.
 """
 
 import torch
-import torch.nn as nn
 from torchvision import transforms
 from transformers import ViTForImageClassification, ViTConfig
 from PIL import Image
@@ -12,9 +11,14 @@ import json
 import numpy as np
 
 class ViTSealClassifier:
+    # Seal counts traced at load time; the OpenCV detector returns at most 2 seals
+    WARMUP_BATCH_SIZES = (1, 2)
+    
     def __init__(self, model_path='vit_seal_checker.pth'):
         self.model_path = model_path
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        # Reduced-precision matmuls for inference: bf16 on CPU, fp16 on GPU
+        self.autocast_dtype = torch.bfloat16 if self.device.type == 'cpu' else torch.float16
         self.model = None
         self.transform = None
         self.classes = ['Real', 'Fake']
@@ -74,6 +78,7 @@ class ViTSealClassifier:
             self.model.load_state_dict(checkpoint['model_state_dict'])
             self.model = self.model.to(self.device)
             self.model.eval()
+            self._compile_model()
             
             self.is_loaded = True
             print(f"✅ ViT Seal Classifier loaded successfully!")
@@ -91,6 +96,74 @@ class ViTSealClassifier:
             print(f"❌ Error loading model: {e}")
             return False
     
+    def _compile_model(self):
+        """Compile the forward pass with torch.compile and warm it up once."""
+        if not hasattr(torch, 'compile'):  # torch < 2.0
+            return
+        
+        eager_model = self.model
+        try:
+            # dynamic=True so a new number of seals reuses the compiled kernels
+            self.model = torch.compile(eager_model, mode='reduce-overhead', fullgraph=False, dynamic=True)
+            
+            # Warm-up so the first real classification does not pay the compile cost.
+            # Batch size 1 is specialized separately from the dynamic graph, so trace both.
+            for batch_size in self.WARMUP_BATCH_SIZES:
+                dummy = torch.zeros(batch_size, 3, 224, 224, device=self.device)
+                with torch.inference_mode(), torch.autocast(self.device.type, dtype=self.autocast_dtype):
+                    self.model(dummy)
+            print("✅ ViT model compiled with torch.compile")
+        except Exception as e:
+            print(f"⚠️ torch.compile unavailable, using eager model: {e}")
+            self.model = eager_model
+    
+    def _load_image(self, image_input):
+        """
+        Convert an image input to an RGB PIL Image.
+        
+        Returns:
+            tuple: (image, None) on success, or (None, error result dict)
+        """
+        if isinstance(image_input, str):
+            # Image path
+            if not os.path.exists(image_input):
+                return None, {
+                    "error": f"Image file not found: {image_input}",
+                    "seal_status": "Error",
+                    "confidence": 0.0
+                }
+            return Image.open(image_input).convert('RGB'), None
+        elif isinstance(image_input, Image.Image):
+            # PIL Image
+            return image_input.convert('RGB'), None
+        elif isinstance(image_input, np.ndarray):
+            # Numpy array
+            return Image.fromarray(image_input).convert('RGB'), None
+        return None, {
+            "error": "Unsupported image input type",
+            "seal_status": "Error",
+            "confidence": 0.0
+        }
+    
+    def _build_result(self, real_prob, fake_prob):
+        """Build the prediction result dict from the two class probabilities."""
+        is_real = real_prob >= fake_prob
+        confidence = real_prob if is_real else fake_prob
+        seal_status = "Real" if is_real else "Fake"
+        
+        return {
+            "step": "Seal Verification",
+            "status": "Pass" if is_real else "Fail",
+            "reason": f"Seal classified as {seal_status.lower()} with {confidence:.2%} confidence",
+            "seal_status": seal_status,
+            "confidence": confidence,
+            "probabilities": {
+                "Real": real_prob,
+                "Fake": fake_prob
+            },
+            "prediction_text": f"{seal_status} ✅" if is_real else f"{seal_status} ❌"
+        }
+    
     def predict_image(self, image_input):
         """
         Predict if a seal/stamp is real or fake.
@@ -101,75 +174,57 @@ class ViTSealClassifier:
         Returns:
             dict: Prediction results with confidence scores
         """
+        return self.predict_batch([image_input])[0]
+    
+    def predict_batch(self, image_inputs):
+        """
+        Predict several seals/stamps in a single forward pass.
+        
+        Args:
+            image_inputs: List of PIL Images, image paths (str), or numpy arrays
+            
+        Returns:
+            list: One prediction result dict per input, in input order
+        """
         if not self.load_model():
-            return {
+            return [{
                 "error": "Model not loaded",
                 "seal_status": "Error",
                 "confidence": 0.0
-            }
+            } for _ in image_inputs]
+        
+        results = [None] * len(image_inputs)
+        tensors = []
+        indices = []
         
         try:
-            # Handle different input types
-            if isinstance(image_input, str):
-                # Image path
-                if not os.path.exists(image_input):
-                    return {
-                        "error": f"Image file not found: {image_input}",
-                        "seal_status": "Error",
-                        "confidence": 0.0
-                    }
-                image = Image.open(image_input).convert('RGB')
-            elif isinstance(image_input, Image.Image):
-                # PIL Image
-                image = image_input.convert('RGB')
-            elif isinstance(image_input, np.ndarray):
-                # Numpy array
-                image = Image.fromarray(image_input).convert('RGB')
-            else:
-                return {
-                    "error": "Unsupported image input type",
-                    "seal_status": "Error",
-                    "confidence": 0.0
-                }
-            
-            # Preprocess image
-            image_tensor = self.transform(image).unsqueeze(0).to(self.device)
+            # Preprocess every valid input; bad inputs get their error result
+            for i, image_input in enumerate(image_inputs):
+                image, error = self._load_image(image_input)
+                if error is not None:
+                    results[i] = error
+                    continue
+                tensors.append(self.transform(image))
+                indices.append(i)
             
-            # Make prediction
-            with torch.no_grad():
-                outputs = self.model(image_tensor)
-                probabilities = torch.nn.functional.softmax(outputs.logits, dim=1)
-                confidence, predicted = torch.max(probabilities, 1)
+            if tensors:
+                # One batched forward pass for all seals
+                batch = torch.stack(tensors).to(self.device)
+                with torch.inference_mode(), torch.autocast(self.device.type, dtype=self.autocast_dtype):
+                    outputs = self.model(batch)
+                    probabilities = torch.nn.functional.softmax(outputs.logits.float(), dim=1).tolist()
                 
-                # Get individual class probabilities
-                real_prob = probabilities[0][0].item()
-                fake_prob = probabilities[0][1].item()
-                
-                # Determine result
-                is_real = predicted.item() == 0
-                seal_status = "Real" if is_real else "Fake"
-                
-                result = {
-                    "step": "Seal Verification",
-                    "status": "Pass" if is_real else "Fail",
-                    "reason": f"Seal classified as {seal_status.lower()} with {confidence.item():.2%} confidence",
-                    "seal_status": seal_status,
-                    "confidence": confidence.item(),
-                    "probabilities": {
-                        "Real": real_prob,
-                        "Fake": fake_prob
-                    },
-                    "prediction_text": f"{seal_status} ✅" if is_real else f"{seal_status} ❌"
-                }
+                for i, (real_prob, fake_prob) in zip(indices, probabilities):
+                    results[i] = self._build_result(real_prob, fake_prob)
             
-            return result
+            return results
             
         except Exception as e:
-            return {
+            return [result or {
                 "error": f"Prediction error: {str(e)}",
                 "seal_status": "Error",
                 "confidence": 0.0
-            }
+            } for result in results]
     
     def predict_multiple_seals(self, seal_images):
         """
@@ -188,11 +243,9 @@ class ViTSealClassifier:
                 "confidence": 0.0
             }
         
-        predictions = []
-        for i, seal_image in enumerate(seal_images):
-            result = self.predict_image(seal_image)
+        predictions = self.predict_batch(seal_images)
+        for i, result in enumerate(predictions):
             result['seal_index'] = i + 1
-            predictions.append(result)
         
         # Improved combine results - more lenient approach
         overall_real_count = sum(1 for p in predictions if p.get('seal_status') == 'Real')